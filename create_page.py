@@ -1,7 +1,16 @@
 #!/usr/bin/env python3
+import hashlib
+import json
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional: a real YAML parser for `page --from`; a simple list parser is used otherwise
+try:
+    import yaml
+except ImportError:
+    yaml = None
 
 
 RED = '\033[0;31m'
@@ -9,6 +18,18 @@ GREEN = '\033[0;32m'
 YELLOW = '\033[1;33m'
 BLUE = '\033[0;34m'
 NC = '\033[0m'
+CHECKMARK = '\033[32m✓\033[0m'
+CROSS = '\033[31m𐄂\033[0m'
+
+FEATURES_DIR = "lib/features"
+SERVICE_LOCATOR_PATH = "lib/core/di/service_locator.dart"
+# Cached map of features, their files and their DI registration
+INDEX_PATH = ".flutter_build/feature_index.json"
+INDEX_VERSION = 3
+# Comment inside ServiceLocator.setUp after which feature DI setup calls are added
+FEATURE_DI_MARKER = "//Feature DI setup"
+# Without the marker, calls are added after the last `await X.setup(_serviceLocator);` in setUp
+SETUP_CALL_PATTERN = r'(\s+await\s+\w+\.setup\(_serviceLocator\);\s*\n)(\s*})'
 
 def get_project_name():
     """Get the project name from pubspec.yaml using regex"""
@@ -34,9 +55,14 @@ def get_project_name():
         print(f"Please run this command from the root of a Flutter project.")
         exit(1)
 
-def update_service_locator(project_name, class_prefix, page_name):
-    """Update service_locator.dart with the new feature DI"""
-    service_locator_path = "lib/core/di/service_locator.dart"
+def update_service_locator(project_name, features):
+    """
+    Update service_locator.dart with the DI of new features in a single edit.
+    Parameters:
+        project_name: Package name from pubspec.yaml
+        features: List of (class_prefix, page_name) tuples
+    """
+    service_locator_path = SERVICE_LOCATOR_PATH
     
     if not os.path.isfile(service_locator_path):
         print(f"{YELLOW}Warning: Could not find service_locator.dart at {service_locator_path}.{NC}")
@@ -46,74 +72,246 @@ def update_service_locator(project_name, class_prefix, page_name):
     with open(service_locator_path, 'r') as file:
         content = file.read()
     
-    # Add import statement
-    import_statement = f"import 'package:{project_name}/features/{page_name}/di/{page_name}_di.dart';"
-    if import_statement not in content:
-        # Find the last import statement and add after it
-        import_matches = re.findall(r'import [^;]+;', content)
+    # Add import statements after the last existing import
+    import_statements = [
+        f"import 'package:{project_name}/features/{page_name}/di/{page_name}_di.dart';"
+        for _, page_name in features
+    ]
+    import_statements = [statement for statement in import_statements if statement not in content]
+    if import_statements:
+        import_matches = list(re.finditer(r'import [^;]+;', content))
         if import_matches:
-            last_import = import_matches[-1]
-            content = content.replace(last_import, f"{last_import}\n{import_statement}")
-    
-    # Add DI setup call in setUp method
-    di_call = f"    await {class_prefix}Di.setup(_serviceLocator);"
+            position = import_matches[-1].end()
+            content = content[:position] + "\n" + "\n".join(import_statements) + content[position:]
     
-    # Find the feature DI setup comment and add after it
-    feature_comment_pattern = r'//Feature DI setup'
-    if feature_comment_pattern in content:
-        content = re.sub(
-            r'(//Feature DI setup\s*\n)',
-            f'\\1{di_call}\n',
-            content
-        )
-    else:
-        # If comment doesn't exist, add before the closing brace of setUp method
-        setup_pattern = r'(\s+await\s+\w+\.setup\(_serviceLocator\);\s*\n)(\s*})'
-        match = re.search(setup_pattern, content)
-        if match:
+    # Add DI setup calls in setUp method
+    di_calls = [f"    await {class_prefix}Di.setup(_serviceLocator);" for class_prefix, _ in features]
+    di_calls = [di_call for di_call in di_calls if di_call not in content]
+    if di_calls:
+        di_block = "\n".join(di_calls)
+        # Find the feature DI setup comment and add after it
+        if FEATURE_DI_MARKER in content:
+            content = re.sub(
+                rf'({re.escape(FEATURE_DI_MARKER)}\s*\n)',
+                lambda match: f'{match.group(1)}{di_block}\n',
+                content,
+                count=1
+            )
+        elif has_registration_point(content):
+            # If comment doesn't exist, add before the closing brace of setUp method
             content = re.sub(
-                setup_pattern,
-                f'\\1\n    //Feature DI setup\n{di_call}\n\\2',
-                content
+                SETUP_CALL_PATTERN,
+                lambda match: f'{match.group(1)}\n    {FEATURE_DI_MARKER}\n{di_block}\n{match.group(2)}',
+                content,
+                count=1
             )
+        else:
+            # Imports without their setup calls would only be unused, so nothing is written
+            print(f"{YELLOW}Warning: Could not find where to register features in {service_locator_path}.{NC}")
+            print(f"Add a '{FEATURE_DI_MARKER}' comment inside ServiceLocator.setUp and run again.")
+            return
+    elif not import_statements:
+        return
     
     with open(service_locator_path, 'w') as file:
         file.write(content)
     
-    print(f"{GREEN}✓ Updated service_locator.dart with {class_prefix}Di registration.{NC}")
-    print(f"{BLUE}  Added: {NC}{di_call}")
+    print(f"{GREEN}✓ Updated service_locator.dart with {len(import_statements)} import(s) and "
+          f"{len(di_calls)} feature DI registration(s).{NC}")
+    for statement in import_statements + di_calls:
+        print(f"{BLUE}  Added: {NC}{statement}")
 
-def generate_page(page_name):
-    """Generate Flutter feature structure and files"""
-    if not page_name:
-        print(f"{RED}Error: Page name is required.{NC}")
-        print(f"Usage: {sys.argv[0]} page <page_name>")
+def class_prefix_for(page_name):
+    """Create class prefix - convert snake_case to PascalCase"""
+    return ''.join(word.capitalize() for word in page_name.split('_'))
+
+def load_feature_manifest(manifest_path):
+    """
+    Read feature names from a manifest file. Accepted formats:
+        features:            - a YAML list (optionally under a `features` key)
+          - home               whose items are names or {name: ...} maps
+          - name: settings
+    or a plain text file with one feature name per line.
+    """
+    if not os.path.isfile(manifest_path):
+        print(f"{RED}Error: Feature manifest not found: {manifest_path}{NC}")
         exit(1)
-    
-    project_name = get_project_name()
-    
-    # Convert page name to lowercase
-    page_name = page_name.lower()
-    
-    # Create class prefix - convert snake_case to PascalCase
-    class_prefix = ''.join(word.capitalize() for word in page_name.split('_'))
-    
-    print(f"{YELLOW}Creating feature structure for {class_prefix} in {project_name} project...{NC}\n")
-    
-    # Create folder structure
-    base_path = f"lib/features/{page_name}"
-    os.makedirs(f"{base_path}/data/datasource", exist_ok=True)
-    os.makedirs(f"{base_path}/data/models", exist_ok=True)
-    os.makedirs(f"{base_path}/data/repositories", exist_ok=True)
-    os.makedirs(f"{base_path}/domain/datasource", exist_ok=True)
-    os.makedirs(f"{base_path}/domain/repositories", exist_ok=True)
-    os.makedirs(f"{base_path}/domain/entities", exist_ok=True)
-    os.makedirs(f"{base_path}/domain/usecase", exist_ok=True)
-    os.makedirs(f"{base_path}/presentation/presenter", exist_ok=True)
-    os.makedirs(f"{base_path}/presentation/ui", exist_ok=True)
-    os.makedirs(f"{base_path}/presentation/widgets", exist_ok=True)
-    os.makedirs(f"{base_path}/di", exist_ok=True)
-    
+    with open(manifest_path, 'r', encoding='utf-8') as file:
+        content = file.read()
+    if yaml is not None:
+        data = yaml.safe_load(content)
+        if isinstance(data, dict):
+            data = data.get("features", [])
+        if isinstance(data, str):
+            data = data.split()
+        names = [item.get("name") if isinstance(item, dict) else item for item in (data or [])]
+    else:
+        names = []
+        for line in content.splitlines():
+            line = line.split('#', 1)[0].strip()
+            if not line or line.endswith(':'):
+                continue
+            line = re.sub(r'^-\s*', '', line)
+            line = re.sub(r'^name:\s*', '', line)
+            names.append(line.strip('"\''))
+    return [str(name) for name in names if name]
+
+def file_signature(path):
+    """Return the mtime/size of a path used to detect changes, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+def scan_feature(page_name):
+    """Index entry of one feature directory: its class prefix and generated files"""
+    base_path = f"{FEATURES_DIR}/{page_name}"
+    files = []
+    for root, _, names in os.walk(base_path):
+        files += [os.path.join(root, name).replace(os.sep, '/') for name in names]
+    return {
+        "class_prefix": class_prefix_for(page_name),
+        "files": sorted(files),
+        "di_file": f"{base_path}/di/{page_name}_di.dart",
+        "mtime_ns": file_signature(base_path)["mtime_ns"],
+    }
+
+def has_registration_point(content):
+    """Whether update_service_locator() knows where to add feature DI setup calls in content"""
+    return FEATURE_DI_MARKER in content or re.search(SETUP_CALL_PATTERN, content) is not None
+
+def parse_registrations(content, project_name):
+    """Find the feature DI imports and setup calls in service_locator.dart, and whether it has a registration point"""
+    import_pattern = rf"^import 'package:{re.escape(project_name)}/features/(\w+)/di/\1_di\.dart';$"
+    return {
+        "imports": {match.group(1): match.group(0) for match in re.finditer(import_pattern, content, re.MULTILINE)},
+        "di_calls": {match.group(2): match.group(0).strip()
+                     for match in re.finditer(r'^(\s*)await\s+(\w+)Di\.setup\(_serviceLocator\);', content, re.MULTILINE)},
+        "registration_point": has_registration_point(content),
+    }
+
+def load_project_index(project_name):
+    """
+    Return the feature index, refreshing only the parts whose files changed.
+    A single stat of lib/features validates every feature entry: only when its
+    mtime changed (a feature was added, removed or renamed) are the feature
+    directories listed, and those that are new or whose own mtime changed are
+    rescanned. service_locator.dart is re-parsed when its mtime/size and then
+    its sha256 differ from the recorded ones.
+    """
+    try:
+        with open(INDEX_PATH, 'r', encoding='utf-8') as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        index = {}
+    if index.get("version") != INDEX_VERSION or index.get("project") != project_name:
+        index = {"version": INDEX_VERSION, "project": project_name, "features": {}, "features_dir": None,
+                 "service_locator": None, "registrations": {"imports": {}, "di_calls": {}}}
+    changed = False
+
+    # Feature directories
+    features_dir = file_signature(FEATURES_DIR)
+    if features_dir != index["features_dir"]:
+        on_disk = set()
+        if features_dir is not None:
+            on_disk = {entry.name for entry in os.scandir(FEATURES_DIR) if entry.is_dir()}
+        features = index["features"]
+        for page_name in list(features):
+            if page_name not in on_disk:
+                del features[page_name]
+        for page_name in sorted(on_disk):
+            entry = features.get(page_name)
+            if entry is None or entry["mtime_ns"] != file_signature(f"{FEATURES_DIR}/{page_name}")["mtime_ns"]:
+                features[page_name] = scan_feature(page_name)
+        index["features_dir"] = features_dir
+        changed = True
+
+    # Service locator registrations
+    signature = file_signature(SERVICE_LOCATOR_PATH)
+    recorded = index["service_locator"] or {}
+    if signature is None:
+        if recorded:
+            index["service_locator"] = None
+            index["registrations"] = {"imports": {}, "di_calls": {}}
+            changed = True
+    elif signature != {key: recorded.get(key) for key in signature}:
+        with open(SERVICE_LOCATOR_PATH, 'rb') as file:
+            raw = file.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest != recorded.get("sha256"):
+            index["registrations"] = parse_registrations(raw.decode('utf-8', errors='ignore'), project_name)
+        index["service_locator"] = dict(signature, sha256=digest)
+        changed = True
+
+    if changed:
+        save_project_index(index)
+    return index
+
+def save_project_index(index):
+    """Write the feature index atomically"""
+    os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
+    temp_path = f"{INDEX_PATH}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(index, file, indent=2, sort_keys=True)
+    os.replace(temp_path, INDEX_PATH)
+
+def feature_status(index, page_name):
+    """Return (imported, registered) for a feature according to the index"""
+    registrations = index["registrations"]
+    return page_name in registrations["imports"], class_prefix_for(page_name) in registrations["di_calls"]
+
+def list_features():
+    """Print every feature with its DI registration, answered from the index"""
+    index = load_project_index(get_project_name())
+    features = index["features"]
+    if not features:
+        print(f"{YELLOW}No features found in {FEATURES_DIR}.{NC}")
+        return
+    width = max(len(page_name) for page_name in features)
+    print(f"{BLUE}Features ({len(features)}):{NC}")
+    for page_name, entry in sorted(features.items()):
+        imported, registered = feature_status(index, page_name)
+        if imported and registered:
+            status = f"{CHECKMARK} registered"
+        else:
+            status = f"{CROSS} {'not registered' if not registered else 'not imported'}"
+        print(f"  {page_name.ljust(width)}  {entry['class_prefix'] + 'Di':<24} {len(entry['files']):>2} file(s)  {status}")
+
+def verify_features():
+    """
+    Check that indexed features are complete and registered; exit 1 on problems.
+    Registration is only checked when service_locator.dart has a registration point.
+    """
+    index = load_project_index(get_project_name())
+    check_registrations = index["registrations"].get("registration_point", False)
+    if not check_registrations:
+        print(f"{YELLOW}Warning: {SERVICE_LOCATOR_PATH} has no '{FEATURE_DI_MARKER}' comment inside "
+              f"ServiceLocator.setUp, feature DI registration is not checked.{NC}")
+    problems = []
+    for page_name, entry in sorted(index["features"].items()):
+        missing = [path for path in entry["files"] + [entry["di_file"]] if not os.path.isfile(path)]
+        for path in sorted(set(missing)):
+            problems.append(f"{page_name}: missing file {path}")
+        if not check_registrations:
+            continue
+        imported, registered = feature_status(index, page_name)
+        if not imported:
+            problems.append(f"{page_name}: DI import missing in {SERVICE_LOCATOR_PATH}")
+        if not registered:
+            problems.append(f"{page_name}: {entry['class_prefix']}Di.setup call missing in {SERVICE_LOCATOR_PATH}")
+    for page_name in sorted(index["registrations"]["imports"]):
+        if page_name not in index["features"]:
+            problems.append(f"{page_name}: imported in {SERVICE_LOCATOR_PATH} but {FEATURES_DIR}/{page_name} does not exist")
+    if problems:
+        print(f"{RED}Found {len(problems)} problem(s):{NC}")
+        for problem in problems:
+            print(f"  {CROSS} {problem}")
+        exit(1)
+    print(f"{GREEN}✓ {len(index['features'])} feature(s) verified.{NC}")
+
+def render_feature_files(project_name, page_name, class_prefix):
+    """Return the generated files of a feature as a {path: content} dict"""
     # Generate Domain Repository content
     domain_repository_content = f'''abstract class {class_prefix}Repository {{
   
@@ -218,29 +416,39 @@ class {class_prefix}Page extends StatelessWidget {{
 }}
 '''
     
-    # Write files
-    with open(f"{base_path}/domain/repositories/{page_name}_repository.dart", 'w') as file:
-        file.write(domain_repository_content)
-    
-    with open(f"{base_path}/data/repositories/{page_name}_repository_impl.dart", 'w') as file:
-        file.write(data_repository_content)
-    
-    with open(f"{base_path}/di/{page_name}_di.dart", 'w') as file:
-        file.write(di_content)
-    
-    with open(f"{base_path}/presentation/presenter/{page_name}_presenter.dart", 'w') as file:
-        file.write(presenter_content)
-    
-    with open(f"{base_path}/presentation/presenter/{page_name}_ui_state.dart", 'w') as file:
-        file.write(ui_state_content)
-    
-    with open(f"{base_path}/presentation/ui/{page_name}_page.dart", 'w') as file:
-        file.write(page_content)
-    
-    # Update service locator
-    update_service_locator(project_name, class_prefix, page_name)
+    base_path = f"lib/features/{page_name}"
+    return {
+        f"{base_path}/domain/repositories/{page_name}_repository.dart": domain_repository_content,
+        f"{base_path}/data/repositories/{page_name}_repository_impl.dart": data_repository_content,
+        f"{base_path}/di/{page_name}_di.dart": di_content,
+        f"{base_path}/presentation/presenter/{page_name}_presenter.dart": presenter_content,
+        f"{base_path}/presentation/presenter/{page_name}_ui_state.dart": ui_state_content,
+        f"{base_path}/presentation/ui/{page_name}_page.dart": page_content,
+    }
+
+def write_feature(project_name, page_name, class_prefix):
+    """Create the folder structure and files of one feature"""
+    # Create folder structure
+    base_path = f"lib/features/{page_name}"
+    os.makedirs(f"{base_path}/data/datasource", exist_ok=True)
+    os.makedirs(f"{base_path}/data/models", exist_ok=True)
+    os.makedirs(f"{base_path}/data/repositories", exist_ok=True)
+    os.makedirs(f"{base_path}/domain/datasource", exist_ok=True)
+    os.makedirs(f"{base_path}/domain/repositories", exist_ok=True)
+    os.makedirs(f"{base_path}/domain/entities", exist_ok=True)
+    os.makedirs(f"{base_path}/domain/usecase", exist_ok=True)
+    os.makedirs(f"{base_path}/presentation/presenter", exist_ok=True)
+    os.makedirs(f"{base_path}/presentation/ui", exist_ok=True)
+    os.makedirs(f"{base_path}/presentation/widgets", exist_ok=True)
+    os.makedirs(f"{base_path}/di", exist_ok=True)
     
-    # Print success message
+    # Write files
+    for path, content in render_feature_files(project_name, page_name, class_prefix).items():
+        with open(path, 'w') as file:
+            file.write(content)
+
+def print_feature_tree(page_name, class_prefix):
+    """Print the success message with the structure of a created feature"""
     print(f"\n{GREEN}✓ Feature '{class_prefix}' created successfully!{NC}")
     print(f"  {BLUE}Structure:{NC}")
     print(f"    └── {BLUE}lib/features/{page_name}{NC}")
@@ -264,17 +472,95 @@ class {class_prefix}Page extends StatelessWidget {{
     print(f"        └── {BLUE}di{NC}")
     print(f"            └── {GREEN}{page_name}_di.dart{NC}")
 
+def generate_pages(page_names, overwrite=False):
+    """
+    Generate several features in one run: files are written concurrently and
+    service_locator.dart is edited once for all of them. Features that already
+    exist keep their files (unless overwrite is set) and are only registered
+    if their DI is missing.
+    """
+    # Convert page names to lowercase and drop duplicates, keeping the order
+    page_names = list(dict.fromkeys(name.lower() for name in page_names if name))
+    if not page_names:
+        print(f"{RED}Error: Page name is required.{NC}")
+        print(f"Usage: {sys.argv[0]} page <page_name> [<page_name> ...] | page --from <features.yaml> | page --list | page --verify")
+        exit(1)
+    
+    project_name = get_project_name()
+    index = load_project_index(project_name)
+    features = [(class_prefix_for(page_name), page_name) for page_name in page_names]
+    existing = [feature for feature in features if feature[1] in index["features"]]
+    if existing and not overwrite:
+        for class_prefix, page_name in existing:
+            imported, registered = feature_status(index, page_name)
+            state = "already registered" if imported and registered else "registering its DI only"
+            print(f"{YELLOW}Feature '{page_name}' already exists, {state}.{NC}")
+        new_features = [feature for feature in features if feature not in existing]
+    else:
+        new_features = features
+    unregistered = [feature for feature in features if feature_status(index, feature[1]) != (True, True)]
+    if not new_features and not unregistered:
+        print(f"{GREEN}✓ Nothing to do, all features exist and are registered.{NC}")
+        return
+    
+    if new_features:
+        names = ', '.join(class_prefix for class_prefix, _ in new_features)
+        print(f"{YELLOW}Creating feature structure for {names} in {project_name} project...{NC}\n")
+        with ThreadPoolExecutor(max_workers=min(8, len(new_features))) as executor:
+            # list() re-raises the first error of any worker
+            list(executor.map(lambda feature: write_feature(project_name, feature[1], feature[0]), new_features))
+    
+    # Update service locator
+    if unregistered:
+        update_service_locator(project_name, unregistered)
+    # Record the new files and registrations
+    load_project_index(project_name)
+    
+    if len(new_features) == 1:
+        class_prefix, page_name = new_features[0]
+        print_feature_tree(page_name, class_prefix)
+    elif new_features:
+        print(f"\n{GREEN}✓ {len(new_features)} features created successfully!{NC}")
+        for class_prefix, page_name in new_features:
+            print(f"    {BLUE}lib/features/{page_name}{NC} ({class_prefix})")
+
+def run_page_command(args):
+    """Handle `page <name> [<name> ...]`, `page --from <manifest>`, `page --list` and `page --verify`"""
+    if "--list" in args:
+        list_features()
+        return
+    if "--verify" in args:
+        verify_features()
+        return
+    page_names = []
+    overwrite = False
+    remaining = iter(args)
+    for arg in remaining:
+        if arg == "--overwrite":
+            overwrite = True
+        elif arg == "--from":
+            manifest_path = next(remaining, None)
+            if not manifest_path:
+                print(f"{RED}Error: --from expects a manifest file.{NC}")
+                exit(1)
+            page_names += load_feature_manifest(manifest_path)
+        elif arg.startswith("--from="):
+            page_names += load_feature_manifest(arg.split("=", 1)[1])
+        else:
+            page_names.append(arg)
+    generate_pages(page_names, overwrite)
+
 def main():
     if len(sys.argv) < 3:
         print(f"{RED}Error: Insufficient arguments.{NC}")
-        print(f"Usage: {sys.argv[0]} page <page_name>")
+        print(f"Usage: {sys.argv[0]} page <page_name> [<page_name> ...] | page --from <features.yaml> | page --list | page --verify")
         exit(1)
     
     command = sys.argv[1].lower()
     
     if command == "page":
         if len(sys.argv) >= 3:
-            generate_page(sys.argv[2])
+            run_page_command(sys.argv[2:])
         else:
             print(f"{RED}Error: Page name is required.{NC}")
             print(f"Usage: {sys.argv[0]} page <page_name>")
@@ -7,6 +7,21 @@ import platform
 import subprocess
 import glob
 import re  # Added for git tag functionality
+import shutil
+import tempfile
+import zipfile
+import threading
+import hashlib
+import json
+import math
+import struct
+import select
+import ctypes
+import gzip
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
 from functools import wraps
 
 # Cross-platform color support
@@ -26,6 +41,136 @@ NC = '\033[0m'
 MAGENTA = '\033[0;35m'  
 CHECKMARK = '\033[32m✓\033[0m' 
 CROSS = '\033[31m𐄂\033[0m'
+# Use different spinners based on OS
+SPINNER_CHARS = '|/-\\' if platform.system() == "Windows" else '⡿⣟⣯⣷⣾⣽⣻⢿'
+# Seconds between spinner frames; the spinner never decides when a process has exited
+SPINNER_INTERVAL = 0.1
+
+# Working directory for the tool's own state (logs, caches, reports)
+TOOL_DIR = ".flutter_build"
+LOG_DIR = os.path.join(TOOL_DIR, "logs")
+# Optional per-project settings (size budgets, ...)
+PROJECT_CONFIG_FILE = "flutter_build.json"
+# Number of trailing output lines kept in memory and shown when a step fails
+OUTPUT_TAIL_LINES = 40
+# Seconds a cancelled command gets to exit after SIGTERM before it is killed
+TERMINATE_GRACE_SECONDS = 5
+# Per-command policies, matched by argv prefix and overridable with "step_policies" in
+# the project config: wall-clock timeout and no-output watchdog in seconds (None: no
+# limit), and retries with exponential backoff (backoff, 2 * backoff, ...) for idempotent,
+# network-bound commands. Only attempts stopped by the timeout or watchdog, or exiting with
+# one of the transient retry_exit_codes, are retried; other failures are deterministic.
+DEFAULT_COMMAND_POLICY = {"timeout": None, "idle_timeout": None, "retries": 0, "backoff": 2, "retry_exit_codes": []}
+# pub exits with 69 (EX_UNAVAILABLE) when the package server cannot be reached, and git
+# with 128 when the remote cannot be reached (a rejected push exits with 1)
+COMMAND_POLICIES = {
+    "flutter pub get": {"timeout": 900, "idle_timeout": 300, "retries": 3, "retry_exit_codes": [69]},
+    "flutter pub upgrade": {"timeout": 900, "idle_timeout": 300, "retries": 3, "retry_exit_codes": [69]},
+    "pod repo update": {"timeout": 1800, "idle_timeout": 600, "retries": 2},
+    "pod install": {"timeout": 1800, "idle_timeout": 600},
+    "git push": {"timeout": 300, "idle_timeout": 120, "retries": 3, "retry_exit_codes": [128]},
+}
+WATCHDOG_INTERVAL = 1.0
+# Exit codes: a failed command exits with the code of the first pipeline step that failed
+EXIT_FAILURE = 1
+EXIT_INTERRUPTED = 130
+STEP_EXIT_CODES = {
+    "clean": 10,
+    "pub_get": 11, "pub_upgrade": 11, "pub_refresh": 11, "pub_upgrade_major": 11,
+    "gen_l10n": 12,
+    "build_runner": 13,
+    "fix": 14, "format": 14,
+    "analyze": 15,
+    "optimize_assets": 16,
+    "build_apk": 20,
+    "build_apk_split": 21, "build_apk-split": 21,
+    "build_aab": 22,
+    "build_web": 23,
+    "compress_web": 24,
+}
+
+# Default number of pipeline steps allowed to run at the same time
+DEFAULT_JOBS = min(4, os.cpu_count() or 1)
+
+# Global command-line options, filled in by parse_options() from main()
+OPTIONS = {
+    "tail": False,
+    "force": False,
+    "jobs": DEFAULT_JOBS,
+    "trace": None,
+    "no_cache": False,
+    "optimize_assets": False,
+    "changed": False,
+    "base": None,
+    "monitor": None,
+    "keep_going": False,
+    "dry_run": False,
+}
+
+# Release build commands shared by the single-target pipelines and the build matrix
+BUILD_APK_COMMAND = ["flutter", "build", "apk", "--release", "--obfuscate", "--target-platform", "android-arm64", "--split-debug-info=./"]
+BUILD_APK_SPLIT_COMMAND = ["flutter", "build", "apk", "--release", "--split-per-abi", "--obfuscate", "--split-debug-info=./"]
+BUILD_AAB_COMMAND = ["flutter", "build", "appbundle", "--release", "--obfuscate", "--split-debug-info=./"]
+BUILD_WEB_COMMAND = ["flutter", "build", "web", "--release"]
+
+# Build matrix targets: name -> (description, build command, artifact glob relative to the project)
+MATRIX_TARGETS = {
+    "apk": ("Building APK (arm64)...                              ", BUILD_APK_COMMAND,
+            "build/app/outputs/flutter-apk/app-release.apk"),
+    "apk-split": ("Building APK (split-per-abi)...                      ", BUILD_APK_SPLIT_COMMAND,
+                  "build/app/outputs/flutter-apk/app-*-release.apk"),
+    "aab": ("Building AAB...                                      ", BUILD_AAB_COMMAND,
+            "build/app/outputs/bundle/release/*.aab"),
+}
+# Each matrix target builds in its own copy of the project below this directory
+MATRIX_DIR = "build/matrix"
+# Top-level entries not copied into a matrix workspace
+MATRIX_WORKSPACE_SKIP = {"build", ".git", TOOL_DIR, "ios", "macos", "linux", "windows", "web"}
+
+# Files whose content decides whether `flutter pub get` has anything to do
+PUB_FINGERPRINT_INPUTS = ["pubspec.yaml", "pubspec.lock", ".dart_tool/package_config.json"]
+PUB_FINGERPRINT_FILE = ".dart_tool/flutter_build_pub_fingerprint.json"
+# Inputs of `pod install` as of the last successful run, and CocoaPods' own copy of the lock
+POD_PODFILE = "ios/Podfile"
+POD_LOCKFILE = "ios/Podfile.lock"
+POD_MANIFEST = "ios/Pods/Manifest.lock"
+POD_FINGERPRINT_FILE = os.path.join(TOOL_DIR, "pod_fingerprint.json")
+
+# Records input/output hashes of the code generators so unchanged trees skip them
+CODEGEN_MANIFEST_FILE = os.path.join(TOOL_DIR, "codegen_manifest.json")
+# Suffixes of files written by build_runner generators
+GENERATED_DART_SUFFIXES = ('.g.dart', '.freezed.dart', '.drift.dart', '.config.dart', '.mocks.dart', '.gr.dart')
+# Source lines that make a Dart file an input of build_runner
+CODEGEN_SOURCE_PATTERN = re.compile(
+    r"^\s*(part\s+'[^']+'\s*;|@(DriftDatabase|DriftAccessor|JsonSerializable|HiveType|freezed|Freezed|riverpod|Riverpod|injectable|InjectableInit)\b)",
+    re.MULTILINE,
+)
+PART_DIRECTIVE_PATTERN = re.compile(r"^\s*part\s+'([^']+)'\s*;", re.MULTILINE)
+
+# Descriptions of the steps skipped as cache hits during the current command
+CACHE_HITS = []
+
+# Serializes writes to the terminal between the spinner and live-tail readers
+_CONSOLE_LOCK = threading.Lock()
+# Serializes read-modify-write cycles on the JSON state files
+_STATE_LOCK = threading.Lock()
+# Progress board of the pipeline currently running steps concurrently, if any
+_ACTIVE_BOARD = None
+# Per-thread information about the pipeline step being executed
+_STEP_STATE = threading.local()
+# Child processes that are running, mapped to whether they belong to a speculative step
+_RUNNING_PROCESSES = {}
+# Set when speculative steps / all steps of the running pipeline have to stop
+_SPECULATION_CANCELLED = threading.Event()
+_PIPELINE_CANCELLED = threading.Event()
+# Pipeline steps that failed during this run, in order
+FAILED_STEPS = []
+
+# Finished trace spans of this invocation, exported by --trace
+TRACE_SPANS = []
+TRACE_EPOCH = time.time()
+_TRACE_LOCK = threading.Lock()
+_TRACE_IDS = iter(range(1, sys.maxsize))
 
 def timer_decorator(func):
     """
@@ -34,9 +179,11 @@ def timer_decorator(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
         start_time = time.time()
+        first_span = len(TRACE_SPANS)
         
         # Execute the original function
-        result = func(*args, **kwargs)
+        with trace_span(func.__name__, "command"):
+            result = func(*args, **kwargs)
         
         end_time = time.time()
         total_seconds = end_time - start_time
@@ -45,52 +192,367 @@ def timer_decorator(func):
         print(f"\n{BLUE}======================================================{NC}")
         print(f"{BLUE}Total time taken: {int(minutes)} minute(s) and {seconds:.2f} seconds.{NC}")
         print(f"{BLUE}======================================================{NC}")
+        report_step_timings(TRACE_SPANS[first_span:])
+        report_cache_hits()
         
         return result
     return wrapper
 
+@contextmanager
+def trace_span(name, category, parent=None, **args):
+    """
+    Records the enclosed block as a trace span. Spans opened inside it on the
+    same thread become its children; pass `parent` to attach a span that runs
+    on another thread.
+    Yields the span so callers can add to its args.
+    """
+    stack = getattr(_STEP_STATE, "span_stack", None)
+    if stack is None:
+        stack = _STEP_STATE.span_stack = []
+    if parent is None and stack:
+        parent = stack[-1]
+    thread = threading.current_thread()
+    span = {
+        "id": next(_TRACE_IDS),
+        "parent": parent["id"] if parent else None,
+        "name": name,
+        "cat": category,
+        "start": time.time(),
+        "tid": thread.ident,
+        "thread": thread.name,
+        "args": dict(args),
+    }
+    stack.append(span)
+    try:
+        yield span
+    finally:
+        stack.pop()
+        span["end"] = time.time()
+        with _TRACE_LOCK:
+            TRACE_SPANS.append(span)
+
+def current_span():
+    """Returns the innermost open span of the current thread, if any"""
+    stack = getattr(_STEP_STATE, "span_stack", None)
+    return stack[-1] if stack else None
+
+def step_name(description):
+    """Human readable step name derived from its spinner description"""
+    return description.strip().rstrip('.').strip()
+
+def report_step_timings(spans):
+    """Prints one line per command span: how long it took and how it ended"""
+    steps = sorted((span for span in spans if span["cat"] == "step_command"), key=lambda span: span["start"])
+    if not steps:
+        return
+    names = [span["name"] + (f" (retry {span['args']['attempt'] - 1})" if span["args"].get("attempt", 1) > 1 else "")
+             for span in steps]
+    width = max(len(name) for name in names)
+    monitored = any("resources" in span["args"] for span in steps)
+    result_width = 10 if monitored else 0
+    header = f"{'Step'.ljust(width)}  {'Time':>9}  {'Result':<{result_width}}"
+    if monitored:
+        header += f"  {'Peak RSS':>10}  {'CPU':>8}  {'Procs':>5}  {'Read':>10}  {'Written':>10}"
+    print(f"{BLUE}{header}{NC}")
+    for name, span in zip(names, steps):
+        if span["args"].get("cached"):
+            outcome = f"{BLUE}{'cached':<{result_width}}{NC}"
+        elif span["args"].get("killed_by"):
+            killed = "timeout" if span["args"]["killed_by"].startswith("timeout") else "no output"
+            outcome = f"{RED}{killed:<{result_width}}{NC}"
+        elif span["args"].get("exit_code") == 0:
+            outcome = f"{GREEN}{'ok':<{result_width}}{NC}"
+        else:
+            outcome = f"{RED}{'exit ' + str(span['args'].get('exit_code')):<{result_width}}{NC}"
+        line = f"{name.ljust(width)}  {span['end'] - span['start']:>8.2f}s  {outcome}"
+        resources = span["args"].get("resources")
+        if resources:
+            line += (f"  {format_size(resources['peak_rss_bytes']):>10}  {resources['cpu_seconds']:>7.2f}s"
+                     f"  {resources['processes']:>5}  {format_size(resources['read_bytes']):>10}"
+                     f"  {format_size(resources['write_bytes']):>10}")
+        print(line.rstrip())
+    retries = sum(1 for span in steps if span["args"].get("attempt", 1) > 1)
+    stopped = sum(1 for span in steps if span["args"].get("killed_by"))
+    if retries or stopped:
+        print(f"{YELLOW}{retries} retry attempt(s), {stopped} command(s) stopped by a timeout or the no-output watchdog{NC}")
+
+def write_trace(path):
+    """Writes the recorded spans as Chrome/Perfetto trace events (chrome://tracing, ui.perfetto.dev)"""
+    pid = os.getpid()
+    thread_ids = {}
+    events = []
+    for span in sorted(TRACE_SPANS, key=lambda span: span["start"]):
+        if span["tid"] not in thread_ids:
+            thread_ids[span["tid"]] = len(thread_ids) + 1
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_ids[span["tid"]],
+                           "args": {"name": span["thread"]}})
+        events.append({
+            "name": span["name"],
+            "cat": span["cat"],
+            "ph": "X",
+            "ts": round((span["start"] - TRACE_EPOCH) * 1e6),
+            "dur": round((span["end"] - span["start"]) * 1e6),
+            "pid": pid,
+            "tid": thread_ids[span["tid"]],
+            "args": dict(span["args"], span_id=span["id"], parent_id=span["parent"]),
+        })
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+    print(f"{BLUE}Trace with {len(TRACE_SPANS)} span(s) written to {path}{NC}")
+
+# ============================================================================
+# RESOURCE MONITOR
+# ============================================================================
+
+# Seconds between two samples of a step's process tree
+MONITOR_INTERVAL = 0.5
+DEFAULT_RESOURCE_REPORT = os.path.join(TOOL_DIR, "resources.json")
+
+def monitoring_supported():
+    """Process trees can only be sampled where /proc exists (Linux)"""
+    return os.path.isdir("/proc/self")
+
+def read_proc_stat(pid):
+    """Returns (ppid, cpu_ticks, rss_pages) from /proc/<pid>/stat, or None if the process is gone"""
+    try:
+        with open(f"/proc/{pid}/stat", 'r') as file:
+            content = file.read()
+    except OSError:
+        return None
+    # The command name is in parentheses and may itself contain spaces
+    fields = content[content.rfind(')') + 2:].split()
+    return int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[21])
+
+def read_proc_io(pid):
+    """Returns (read_bytes, write_bytes) from /proc/<pid>/io, or (0, 0) if unavailable"""
+    values = {}
+    try:
+        with open(f"/proc/{pid}/io", 'r') as file:
+            for line in file:
+                key, _, value = line.partition(':')
+                values[key] = int(value)
+    except (OSError, ValueError):
+        pass
+    return values.get("read_bytes", 0), values.get("write_bytes", 0)
+
+class ResourceMonitor:
+    """
+    Samples a child process and all of its descendants from /proc every
+    MONITOR_INTERVAL seconds, keeping peak RSS, CPU time, process counts and
+    disk I/O. Processes that live shorter than one interval may be missed.
+    Usage:
+        with ResourceMonitor(process.pid) as monitor:
+            process.wait()
+        monitor.result()
+    """
+
+    def __init__(self, root_pid):
+        self.root_pid = root_pid
+        self.page_size = os.sysconf("SC_PAGE_SIZE")
+        self.clock_ticks = os.sysconf("SC_CLK_TCK")
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._sample_loop, daemon=True)
+        self.per_process = {}
+        self.peak_rss = 0
+        self.peak_processes = 0
+        self.samples = 0
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stopped.set()
+        self.thread.join()
+        return False
+
+    def _process_tree(self):
+        """Returns {pid: stat} of the root process and all of its descendants"""
+        stats = {}
+        children = {}
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                stat = read_proc_stat(int(entry))
+                if stat:
+                    stats[int(entry)] = stat
+                    children.setdefault(stat[0], []).append(int(entry))
+        tree = {}
+        pending = [self.root_pid]
+        while pending:
+            pid = pending.pop()
+            if pid in stats and pid not in tree:
+                tree[pid] = stats[pid]
+                pending += children.get(pid, [])
+        return tree
+
+    def _sample(self):
+        tree = self._process_tree()
+        self.samples += 1
+        self.peak_processes = max(self.peak_processes, len(tree))
+        self.peak_rss = max(self.peak_rss, sum(stat[2] for stat in tree.values()) * self.page_size)
+        for pid, (_, cpu_ticks, _) in tree.items():
+            read_bytes, write_bytes = read_proc_io(pid)
+            previous = self.per_process.get(pid, (0, 0, 0))
+            self.per_process[pid] = (max(previous[0], cpu_ticks), max(previous[1], read_bytes),
+                                     max(previous[2], write_bytes))
+
+    def _sample_loop(self):
+        while True:
+            self._sample()
+            if self.stopped.wait(MONITOR_INTERVAL):
+                break
+
+    def result(self):
+        """The aggregated measurements of the whole run"""
+        return {
+            "peak_rss_bytes": self.peak_rss,
+            "cpu_seconds": round(sum(values[0] for values in self.per_process.values()) / self.clock_ticks, 2),
+            "processes": len(self.per_process),
+            "peak_processes": self.peak_processes,
+            "read_bytes": sum(values[1] for values in self.per_process.values()),
+            "write_bytes": sum(values[2] for values in self.per_process.values()),
+            "samples": self.samples,
+        }
+
+@contextmanager
+def monitor_process(process, span):
+    """Samples process while the block runs when --monitor is set, storing the result in span"""
+    if not OPTIONS["monitor"] or not monitoring_supported():
+        yield
+        return
+    with ResourceMonitor(process.pid) as monitor:
+        yield
+    span["args"]["resources"] = monitor.result()
+
+def write_resource_report(path):
+    """Writes the resource usage of every monitored command as JSON"""
+    steps = [{"step": span["name"], "argv": span["args"].get("argv", []),
+              "exit_code": span["args"].get("exit_code"), "seconds": round(span["end"] - span["start"], 3),
+              **span["args"]["resources"]}
+             for span in sorted(TRACE_SPANS, key=lambda span: span["start"])
+             if span["cat"] == "step_command" and "resources" in span["args"]]
+    if not steps:
+        if not monitoring_supported():
+            print(f"{YELLOW}Resource monitoring needs /proc and is not available on this system{NC}")
+        return
+    save_json(path, {"interval_seconds": MONITOR_INTERVAL, "steps": steps})
+    print(f"{BLUE}Resource usage of {len(steps)} step(s) written to {path}{NC}")
+
+def is_interactive():
+    """True when stdout is a terminal that can show spinners and cursor movement"""
+    return sys.stdout.isatty()
+
+def mark_line(description, icon):
+    """Formats a finished step line: the icon replaces the spinner after the description"""
+    if is_interactive():
+        return f"{description}\b{icon} "
+    return f"{description}{icon} "
+
+def spin(stopped):
+    """Spinner renderer thread: redraws one frame every SPINNER_INTERVAL until stopped is set"""
+    spinner_index = 0
+    while True:
+        with _CONSOLE_LOCK:
+            print(f"\b{MAGENTA}{SPINNER_CHARS[spinner_index]}{NC}", end='', flush=True)
+        spinner_index = (spinner_index + 1) % len(SPINNER_CHARS)
+        if stopped.wait(SPINNER_INTERVAL):
+            return
+
 def show_loading(description, process):
     """
-    Displays a loading spinner with a custom message while a process is running
+    Displays a loading spinner with a custom message while a process is running.
+    The calling thread blocks in process.wait(), so the exit is noticed as soon
+    as it happens; the spinner is a separate throttled renderer that is not
+    started at all when stdout is not a terminal.
     Parameters:
         description: Description message to display
         process: Process object to monitor
     """
-    spinner_index = 0
-    # Use different spinners based on OS
-    if platform.system() == "Windows":
-        braille_spinner_list = '|/-\\'
-    else:
-        braille_spinner_list = '⡿⣟⣯⣷⣾⣽⣻⢿'
-    
-    print(description, end='', flush=True)
-    # Continue spinning while the process is running
-    while process.poll() is None:
-        print(f"\b{MAGENTA}{braille_spinner_list[spinner_index]}{NC}", end='', flush=True)
-        spinner_index = (spinner_index + 1) % len(braille_spinner_list)
-        time.sleep(0.1 if platform.system() == "Windows" else 0.025)
-    stdout, stderr = process.communicate()
+    if _ACTIVE_BOARD is not None:
+        # The pipeline's progress board animates the step instead
+        return process.wait() == 0
+    with _CONSOLE_LOCK:
+        print(description, end='', flush=True)
+    stopped = threading.Event()
+    spinner = None
+    if is_interactive():
+        spinner = threading.Thread(target=spin, args=(stopped,), daemon=True)
+        spinner.start()
+    try:
+        process.wait()
+    finally:
+        stopped.set()
+        if spinner is not None:
+            spinner.join()
     # Display success or failure icon based on the process exit status
-    if process.returncode == 0:
-        print(f"\b{CHECKMARK} ", flush=True)
-        # Nicher ei stdout statement ta comment out korle r command er out put dekha jabe na.
-        # if stdout:
-        #     print(f"\n{GREEN}Output:\n{stdout.decode()}{NC}")
-        return True
-    else:
-        print(f"\b{CROSS} ", flush=True)
-        # Nicher ei stdout statement ta comment out korle r command er out put dekha jabe na.
-        if stdout:
-            try:
-                print(f"\n{GREEN}Output:\n{stdout.decode('utf-8', errors='ignore')}{NC}")
-            except:
-                print(f"\n{GREEN}Output:\n{stdout}{NC}")
-        if stderr:
-            try:
-                print(f"\n{RED}Error Output:\n{stderr.decode('utf-8', errors='ignore')}{NC}")
-            except:
-                print(f"\n{RED}Error Output:\n{stderr}{NC}")
-        return False
+    success = process.returncode == 0
+    with _CONSOLE_LOCK:
+        print(mark_line("", CHECKMARK if success else CROSS), flush=True)
+    return success
+
+def console_print(text):
+    """Prints a line without corrupting the spinner or the progress board of a running pipeline"""
+    board = _ACTIVE_BOARD
+    if board is not None:
+        board.print_above(text)
+        return
+    with _CONSOLE_LOCK:
+        print(text, flush=True)
+
+def step_slug(description):
+    """Turns a step description into a file-name friendly identifier"""
+    slug = re.sub(r'[^a-z0-9]+', '_', description.strip().lower()).strip('_')
+    return slug or "step"
+
+def drain_stream(stream, stream_name, log_file, log_lock, tail_buffer, live_prefix=None, activity=None):
+    """
+    Reads a child process pipe line by line until EOF so the pipe never fills up.
+    Parameters:
+        stream: Pipe to read from (text mode)
+        stream_name: 'stdout' or 'stderr'
+        log_file: Open file that receives every line
+        log_lock: Lock shared by the readers writing to log_file
+        tail_buffer: Bounded deque keeping the last lines as (stream_name, line)
+        live_prefix: When set, lines are echoed above the spinner, followed by this prefix
+        activity: Dict whose "last_output" is set to the time of every line read
+    """
+    try:
+        for line in iter(stream.readline, ''):
+            if activity is not None:
+                activity["last_output"] = time.time()
+            with log_lock:
+                log_file.write(line)
+                log_file.flush()
+            line = line.rstrip('\r\n')
+            tail_buffer.append((stream_name, line))
+            if live_prefix is not None:
+                color = RED if stream_name == "stderr" else NC
+                board = _ACTIVE_BOARD
+                if board is not None:
+                    board.print_above(f"{color}{line}{NC}")
+                    continue
+                with _CONSOLE_LOCK:
+                    if is_interactive():
+                        # Clear the spinner line, print the output line and redraw the spinner line
+                        print(f"\r\033[K{color}{line}{NC}\n{live_prefix} ", end='', flush=True)
+                    else:
+                        print(f"\n{color}{line}{NC}", end='', flush=True)
+    finally:
+        stream.close()
+
+def print_output_tail(tail_buffer, log_path):
+    """Prints the last captured output lines of a failed step and where the full log is"""
+    lines = []
+    if tail_buffer:
+        lines.append(f"\n{YELLOW}Last {len(tail_buffer)} line(s) of output:{NC}")
+        for stream_name, line in tail_buffer:
+            color = RED if stream_name == "stderr" else GREEN
+            lines.append(f"{color}{line}{NC}")
+    lines.append(f"\n{BLUE}Full log: {log_path}{NC}")
+    console_print("\n".join(lines))
 
 def display_apk_size():
     """Function to display APK size"""
@@ -103,26 +565,324 @@ def display_apk_size():
     else:
         print(f"{RED}APK file not found in build/app/outputs/flutter-apk/{NC}")
 
-def run_flutter_command(cmd_list, description):
+def command_policy(cmd_list):
+    """
+    Timeout, watchdog and retry policy of a command: DEFAULT_COMMAND_POLICY updated
+    with every COMMAND_POLICIES entry and "step_policies" entry of the project config
+    whose argv prefix matches, longer prefixes last.
+    """
+    policy = dict(DEFAULT_COMMAND_POLICY)
+    entries = list(COMMAND_POLICIES.items()) + list(load_project_config().get("step_policies", {}).items())
+    matches = [(prefix.split(), values) for prefix, values in entries
+               if [os.path.basename(cmd_list[0])] + list(cmd_list[1:len(prefix.split())]) == prefix.split()]
+    for _, values in sorted(matches, key=lambda match: len(match[0])):
+        policy.update(values)
+    return policy
+
+def watch_process(process, policy, activity, stopped):
+    """
+    Watchdog thread: stops the process tree when it runs longer than the policy's
+    timeout or prints nothing for idle_timeout seconds, recording why in activity.
+    """
+    started = time.time()
+    while not stopped.wait(WATCHDOG_INTERVAL):
+        now = time.time()
+        if policy["timeout"] and now - started > policy["timeout"]:
+            activity["killed_by"] = f"timeout after {policy['timeout']}s"
+        elif policy["idle_timeout"] and now - activity["last_output"] > policy["idle_timeout"]:
+            activity["killed_by"] = f"no output for {policy['idle_timeout']}s"
+        else:
+            continue
+        terminate_processes([process])
+        return
+
+def run_flutter_command(cmd_list, description, cwd=None):
     """
     Runs a flutter/dart command with a loading spinner.
+    Output is streamed while the command runs: both pipes are drained by reader
+    threads into a per-step log file under LOG_DIR, and only the last
+    OUTPUT_TAIL_LINES lines are kept in memory to be shown on failure.
+    The command's policy (see command_policy) can stop it after a timeout or a
+    silent period and retry it with exponential backoff.
     Parameters:
         cmd_list: List of command arguments
         description: Description to show with spinner
+        cwd: Directory to run the command in (default: current directory)
     """
     # Windows compatibility for shell commands
     shell_needed = platform.system() == "Windows" and cmd_list[0] in ['timeout', 'start', 'flutter', 'dart']
-    
-    process = subprocess.Popen(
-        cmd_list,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        shell=shell_needed,
-        text=True if sys.version_info >= (3, 7) else False,
-        encoding='utf-8' if sys.version_info >= (3, 6) else None,
-        errors='ignore' if sys.version_info >= (3, 6) else None
-    )
-    return show_loading(description, process)
+
+    os.makedirs(LOG_DIR, exist_ok=True)
+    log_path = os.path.join(LOG_DIR, f"{step_slug(description)}.log")
+    tail_buffer = deque(maxlen=OUTPUT_TAIL_LINES)
+    log_lock = threading.Lock()
+    live_prefix = description if OPTIONS["tail"] else None
+    speculative = getattr(_STEP_STATE, "speculative", False)
+    policy = command_policy(cmd_list)
+    attempts = 1 + max(0, int(policy["retries"]))
+
+    for attempt in range(1, attempts + 1):
+        activity = {"last_output": time.time(), "killed_by": None}
+        with trace_span(step_name(description), "step_command", argv=list(cmd_list), cached=False,
+                        attempt=attempt) as span, \
+                open(log_path, 'w' if attempt == 1 else 'a', encoding='utf-8') as log_file:
+            log_file.write(f"$ {' '.join(cmd_list)}\n" if attempt == 1 else f"\n--- attempt {attempt}/{attempts} ---\n")
+            tail_buffer.clear()
+            process = subprocess.Popen(
+                cmd_list,
+                cwd=cwd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                shell=shell_needed,
+                # Own process group, so the whole tree can be stopped on failure or Ctrl+C
+                start_new_session=platform.system() != "Windows",
+                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if platform.system() == "Windows" else 0,
+                text=True if sys.version_info >= (3, 7) else False,
+                encoding='utf-8' if sys.version_info >= (3, 6) else None,
+                errors='ignore' if sys.version_info >= (3, 6) else None
+            )
+            readers = [
+                threading.Thread(
+                    target=drain_stream,
+                    args=(pipe, name, log_file, log_lock, tail_buffer, live_prefix, activity),
+                    daemon=True,
+                )
+                for pipe, name in ((process.stdout, "stdout"), (process.stderr, "stderr"))
+            ]
+            for reader in readers:
+                reader.start()
+            _RUNNING_PROCESSES[process] = speculative
+            if step_cancelled(speculative):
+                terminate_processes([process])
+            watchdog_stopped = threading.Event()
+            if policy["timeout"] or policy["idle_timeout"]:
+                threading.Thread(target=watch_process, args=(process, policy, activity, watchdog_stopped),
+                                 daemon=True).start()
+            with monitor_process(process, span):
+                success = show_loading(description, process)
+            watchdog_stopped.set()
+            for reader in readers:
+                reader.join()
+            _RUNNING_PROCESSES.pop(process, None)
+            span["args"]["exit_code"] = process.returncode
+            if activity["killed_by"]:
+                span["args"]["killed_by"] = activity["killed_by"]
+
+        if success or step_cancelled(speculative):
+            break
+        reason = activity["killed_by"] or f"exit {process.returncode}"
+        transient = activity["killed_by"] or process.returncode in policy["retry_exit_codes"]
+        if attempt == attempts or not transient:
+            if activity["killed_by"]:
+                console_print(f"{RED}  {step_name(description)} stopped: {reason}{NC}")
+            break
+        delay = policy["backoff"] * 2 ** (attempt - 1)
+        console_print(f"{YELLOW}  {step_name(description)} failed ({reason}), retrying in {delay:g}s "
+                      f"(attempt {attempt + 1}/{attempts}){NC}")
+        if _PIPELINE_CANCELLED.wait(delay):
+            break
+
+    if not success and not step_cancelled(speculative):
+        print_output_tail(tail_buffer, log_path)
+    return success
+
+def hash_files(paths):
+    """
+    Returns a sha256 fingerprint over the paths and contents of the given files,
+    or None if any of them is missing.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        if not os.path.isfile(path):
+            return None
+        digest.update(path.encode('utf-8') + b'\0')
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(chunk)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def load_json(path, default):
+    """Reads a JSON state file, falling back to default when it is missing or corrupt"""
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return default
+
+def save_json(path, data):
+    """Writes a JSON state file atomically, creating its directory if needed"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+def report_cache_hit(description, cmd_list=None):
+    """Prints a step as done without running it and records it as a cache hit"""
+    CACHE_HITS.append(step_name(description))
+    with trace_span(step_name(description), "step_command", argv=list(cmd_list or []), cached=True, exit_code=0):
+        pass
+    if getattr(_STEP_STATE, "step_id", None) is not None:
+        # The pipeline prints the step's line itself and marks it as cached
+        _STEP_STATE.cached = True
+        if _ACTIVE_BOARD is not None:
+            return
+    console_print(f"{mark_line(description, CHECKMARK)}{BLUE}(cached){NC}")
+
+def report_cache_hits():
+    """Prints the steps skipped as cache hits during the current command"""
+    if not CACHE_HITS:
+        return
+    print(f"{BLUE}Skipped {len(CACHE_HITS)} step(s) as cache hits (use --force to re-run):{NC}")
+    for description in CACHE_HITS:
+        print(f"{BLUE}  - {description}{NC}")
+
+def run_pub_command(cmd_list, description, cacheable=True):
+    """
+    Runs a `flutter pub` dependency resolution step, skipping it when pubspec.yaml,
+    pubspec.lock and .dart_tool/package_config.json are unchanged since the last
+    successful resolution.
+    Parameters:
+        cmd_list: List of command arguments
+        description: Description to show with spinner
+        cacheable: False for steps that must always reach the network (e.g. upgrades)
+    """
+    fingerprint = hash_files(PUB_FINGERPRINT_INPUTS)
+    stored = load_json(PUB_FINGERPRINT_FILE, {}).get("fingerprint")
+    if cacheable and not OPTIONS["force"] and fingerprint is not None and fingerprint == stored:
+        report_cache_hit(description, cmd_list)
+        return True
+    success = run_flutter_command(cmd_list, description)
+    if success:
+        # Resolution rewrites the lock file and package config, so fingerprint the result
+        fingerprint = hash_files(PUB_FINGERPRINT_INPUTS)
+        if fingerprint is not None:
+            save_json(PUB_FINGERPRINT_FILE, {"fingerprint": fingerprint, "command": " ".join(cmd_list)})
+    return success
+
+def hash_file(path):
+    """Returns the sha256 of a single file's content, or None if it does not exist"""
+    if not os.path.isfile(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def read_simple_yaml(path):
+    """Reads the top-level `key: value` pairs of a flat YAML file such as l10n.yaml"""
+    values = {}
+    if not os.path.isfile(path):
+        return values
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            match = re.match(r'^([A-Za-z0-9_-]+):\s*(.*?)\s*(#.*)?$', line)
+            if match:
+                values[match.group(1)] = match.group(2).strip('"\'')
+    return values
+
+def collect_build_runner_files():
+    """
+    Returns (inputs, outputs) of build_runner: Dart sources under lib/ with codegen
+    annotations or part directives, and the generated part files they reference.
+    """
+    inputs = [path for path in ("pubspec.lock", "build.yaml") if os.path.isfile(path)]
+    outputs = []
+    for root, _, files in os.walk("lib"):
+        for name in sorted(files):
+            if not name.endswith('.dart') or name.endswith(GENERATED_DART_SUFFIXES):
+                continue
+            path = os.path.join(root, name).replace(os.sep, '/')
+            with open(path, 'r', encoding='utf-8', errors='ignore') as file:
+                content = file.read()
+            if not CODEGEN_SOURCE_PATTERN.search(content):
+                continue
+            inputs.append(path)
+            for part in PART_DIRECTIVE_PATTERN.findall(content):
+                if part.endswith(GENERATED_DART_SUFFIXES):
+                    outputs.append(os.path.normpath(os.path.join(root, part)).replace(os.sep, '/'))
+    return sorted(inputs), sorted(outputs)
+
+def collect_l10n_files():
+    """
+    Returns (inputs, outputs) of flutter gen-l10n: l10n.yaml, pubspec.yaml and the
+    .arb files, and the generated localization Dart files.
+    """
+    config = read_simple_yaml("l10n.yaml")
+    arb_dir = config.get("arb-dir", "lib/l10n")
+    if config.get("output-dir"):
+        output_dir = config["output-dir"]
+    elif config.get("synthetic-package", "true") == "false":
+        output_dir = arb_dir
+    else:
+        output_dir = ".dart_tool/flutter_gen/gen_l10n"
+    inputs = [path for path in ("l10n.yaml", "pubspec.yaml") if os.path.isfile(path)]
+    inputs += sorted(glob.glob(f"{arb_dir}/*.arb"))
+    output_file = config.get("output-localization-file", "app_localizations.dart")
+    outputs = [f"{output_dir}/{output_file}"]
+    outputs += [path for path in sorted(glob.glob(f"{output_dir}/*.dart")) if path not in outputs]
+    return [path.replace(os.sep, '/') for path in inputs], [path.replace(os.sep, '/') for path in outputs]
+
+# Code generators: name -> (command, function returning (inputs, outputs))
+CODEGEN_GENERATORS = {
+    "build_runner": (["dart", "run", "build_runner", "build", "--delete-conflicting-outputs"], collect_build_runner_files),
+    "gen_l10n": (["flutter", "gen-l10n"], collect_l10n_files),
+}
+
+def codegen_stale_reason(record, input_hashes, output_hashes):
+    """Returns why a generator has to run, or None if its recorded state still matches"""
+    if not record:
+        return "no previous run recorded"
+    recorded_inputs = record.get("inputs", {})
+    changed = sorted(set(input_hashes) ^ set(recorded_inputs))
+    changed += sorted(path for path in input_hashes if path in recorded_inputs and input_hashes[path] != recorded_inputs[path])
+    if changed:
+        return f"{len(changed)} input(s) changed: {', '.join(changed[:3])}{' ...' if len(changed) > 3 else ''}"
+    for path, recorded_digest in sorted(record.get("outputs", {}).items()):
+        digest = output_hashes[path] if path in output_hashes else hash_file(path)
+        if digest is None:
+            return f"output missing: {path}"
+        if digest != recorded_digest:
+            return f"output modified: {path}"
+    return None
+
+def run_codegen_command(generator, description):
+    """
+    Runs a code generator only when one of its inputs changed or one of its outputs
+    is missing or was modified since the last successful run.
+    Parameters:
+        generator: Key in CODEGEN_GENERATORS
+        description: Description to show with spinner
+    """
+    cmd_list, collect_files = CODEGEN_GENERATORS[generator]
+    inputs, outputs = collect_files()
+    input_hashes = {path: hash_file(path) for path in inputs}
+    output_hashes = {path: hash_file(path) for path in outputs}
+    manifest = load_json(CODEGEN_MANIFEST_FILE, {})
+    reason = "forced" if OPTIONS["force"] else codegen_stale_reason(manifest.get(generator), input_hashes, output_hashes)
+    if reason is None:
+        report_cache_hit(description, cmd_list)
+        return True
+    console_print(f"{BLUE}  {generator}: {reason}{NC}")
+    success = run_flutter_command(cmd_list, description)
+    if success:
+        inputs, outputs = collect_files()
+        record = {
+            "inputs": {path: hash_file(path) for path in inputs},
+            # Outputs that a generator legitimately does not produce are not tracked
+            "outputs": {path: digest for path, digest in ((p, hash_file(p)) for p in outputs) if digest is not None},
+            "updated_at": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        # Generators may finish concurrently, so re-read the manifest under the lock
+        with _STATE_LOCK:
+            manifest = load_json(CODEGEN_MANIFEST_FILE, {})
+            manifest[generator] = record
+            save_json(CODEGEN_MANIFEST_FILE, manifest)
+    return success
 
 def open_directory(directory_path):
     """Opens a directory based on the operating system"""
@@ -149,203 +909,2171 @@ def open_directory(directory_path):
         print(f"Error opening directory: {e}")
         print(f"Please check: {directory_path}")
 
+# ============================================================================
+# ARTIFACT CACHE FUNCTIONS
+# ============================================================================
+
+# Release artifacts of previous builds, keyed by a hash of everything that affects them
+ARTIFACT_CACHE_DIR = os.path.join(TOOL_DIR, "artifact_cache")
+DEFAULT_ARTIFACT_CACHE_SIZE = "2GB"
+# Sources hashed into the cache key
+ARTIFACT_KEY_DIRS = ["lib", "assets", "android"]
+ARTIFACT_KEY_FILES = ["pubspec.yaml", "pubspec.lock", "l10n.yaml", "build.yaml"]
+# Generated or machine-specific entries inside ARTIFACT_KEY_DIRS that do not affect the build
+ARTIFACT_KEY_SKIP = {"build", ".gradle", ".cxx", ".idea", "local.properties"}
+
+def flutter_sdk_version():
+    """
+    Identifies the Flutter SDK on PATH by its version files, falling back to
+    `flutter --version --machine` when they cannot be found.
+    """
+    flutter_path = shutil.which("flutter")
+    if flutter_path:
+        sdk_root = os.path.dirname(os.path.dirname(os.path.realpath(flutter_path)))
+        version_files = [os.path.join(sdk_root, path) for path in
+                         ("bin/cache/flutter.version.json", "version", "bin/internal/engine.version")]
+        fingerprint = hash_files([path for path in version_files if os.path.isfile(path)])
+        if fingerprint and any(os.path.isfile(path) for path in version_files):
+            return fingerprint
+    try:
+        result = subprocess.run(["flutter", "--version", "--machine"], capture_output=True, text=True,
+                                shell=platform.system() == "Windows")
+        return hashlib.sha256(result.stdout.encode('utf-8')).hexdigest() if result.returncode == 0 else "unknown"
+    except OSError:
+        return "unknown"
+
+def artifact_cache_key(build_command):
+    """Hash of the app sources, pubspec files, Flutter SDK version and the exact build argv"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(build_command).encode('utf-8') + b'\0')
+    digest.update(flutter_sdk_version().encode('utf-8') + b'\0')
+    paths = [path for path in ARTIFACT_KEY_FILES if os.path.isfile(path)]
+    for directory in ARTIFACT_KEY_DIRS:
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = sorted(name for name in dirs if name not in ARTIFACT_KEY_SKIP)
+            paths += [os.path.join(root, name) for name in sorted(files) if name not in ARTIFACT_KEY_SKIP]
+    for path in paths:
+        digest.update(path.replace(os.sep, '/').encode('utf-8') + b'\0')
+        digest.update((hash_file(path) or "").encode('utf-8'))
+    return digest.hexdigest()
+
+def restore_cached_artifacts(key):
+    """Copies the artifacts and symbols of a cached build back into the project. Returns True on a hit."""
+    entry_dir = os.path.join(ARTIFACT_CACHE_DIR, key)
+    manifest_path = os.path.join(entry_dir, "manifest.json")
+    manifest = load_json(manifest_path, None)
+    if not manifest:
+        return False
+    if not all(os.path.isfile(os.path.join(entry_dir, "files", path)) for path in manifest["files"]):
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        return False
+    for path in manifest["files"]:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        shutil.copy2(os.path.join(entry_dir, "files", path), path)
+    manifest["last_used"] = time.time()
+    save_json(manifest_path, manifest)
+    return True
+
+def store_cached_artifacts(key, build_command, artifact_patterns, build_started):
+    """Stores freshly built artifacts and the symbols written since build_started under key"""
+    files = sorted({path for pattern in artifact_patterns for path in glob.glob(pattern)})
+    if not files:
+        return
+    files += sorted(path for path in glob.glob("*.symbols") if os.path.getmtime(path) >= build_started)
+    entry_dir = os.path.join(ARTIFACT_CACHE_DIR, key)
+    temp_dir = f"{entry_dir}.tmp"
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    for path in files:
+        destination = os.path.join(temp_dir, "files", path)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copy2(path, destination)
+    save_json(os.path.join(temp_dir, "manifest.json"), {
+        "argv": build_command,
+        "files": [path.replace(os.sep, '/') for path in files],
+        "size": sum(os.path.getsize(path) for path in files),
+        "created": time.time(),
+        "last_used": time.time(),
+    })
+    shutil.rmtree(entry_dir, ignore_errors=True)
+    os.replace(temp_dir, entry_dir)
+    evict_artifact_cache()
+
+def evict_artifact_cache():
+    """Deletes least recently used cache entries until the cache fits its size cap"""
+    config = load_project_config().get("artifact_cache", {})
+    max_size = parse_size(config.get("max_size", DEFAULT_ARTIFACT_CACHE_SIZE))
+    entries = []
+    for name in os.listdir(ARTIFACT_CACHE_DIR):
+        manifest = load_json(os.path.join(ARTIFACT_CACHE_DIR, name, "manifest.json"), None)
+        if manifest:
+            entries.append((manifest.get("last_used", 0), manifest.get("size", 0), name))
+    total = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total <= max_size:
+            break
+        shutil.rmtree(os.path.join(ARTIFACT_CACHE_DIR, name), ignore_errors=True)
+        total -= size
+
+def run_cached_build(steps, build_command, artifact_patterns, description):
+    """
+    Runs a release pipeline unless a build with the same cache key is cached,
+    in which case its artifacts are restored instead. Successful builds are
+    stored in the cache. --no-cache bypasses the cache, --force only skips restoring.
+    Returns True when the artifacts are in place.
+    """
+    if OPTIONS["no_cache"]:
+        return run_pipeline(steps)
+    key = artifact_cache_key(build_command)
+    if not OPTIONS["force"] and restore_cached_artifacts(key):
+        report_cache_hit(description, build_command)
+        console_print(f"{BLUE}  Restored from artifact cache {key[:12]}{NC}")
+        return True
+    build_started = time.time()
+    success = run_pipeline(steps)
+    if success:
+        # pub get, build_runner and --optimize-assets may have rewritten key inputs, so the
+        # build is stored under the key of the tree it was built from, which the next run computes
+        store_cached_artifacts(artifact_cache_key(build_command), build_command, artifact_patterns, build_started)
+    return success
+
+# ============================================================================
+# PIPELINE SCHEDULER
+# ============================================================================
+
+class ProgressBoard:
+    """
+    Multi-line spinner for pipeline steps running at the same time.
+    In-flight steps are redrawn at the bottom of the terminal, finished steps and
+    any other output are printed above them. Nothing is animated when stdout is
+    not a terminal.
+    """
+
+    def __init__(self):
+        self.active = {}
+        self.drawn_lines = 0
+        self.spinner_index = 0
+        self.interactive = is_interactive()
+        self.stopped = threading.Event()
+        self.renderer = threading.Thread(target=self._render_loop, daemon=True)
+
+    def __enter__(self):
+        if self.interactive:
+            self.renderer.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        if self.renderer.is_alive():
+            self.renderer.join()
+        with _CONSOLE_LOCK:
+            self._clear()
+            sys.stdout.flush()
+
+    def _clear(self):
+        if self.drawn_lines:
+            # Move to the first drawn line and clear everything below it
+            sys.stdout.write(f"\033[{self.drawn_lines}F\033[J")
+            self.drawn_lines = 0
+
+    def _draw(self):
+        if not self.interactive:
+            return
+        char = SPINNER_CHARS[self.spinner_index % len(SPINNER_CHARS)]
+        for description in self.active.values():
+            sys.stdout.write(f"{description}\b{MAGENTA}{char}{NC}\n")
+        self.drawn_lines = len(self.active)
+        sys.stdout.flush()
+
+    def _render_loop(self):
+        while not self.stopped.wait(SPINNER_INTERVAL):
+            with _CONSOLE_LOCK:
+                self.spinner_index += 1
+                self._clear()
+                self._draw()
+
+    def print_above(self, text):
+        """Prints text above the in-flight steps"""
+        with _CONSOLE_LOCK:
+            self._clear()
+            print(text, flush=True)
+            self._draw()
+
+    def start_step(self, step_id, description):
+        with _CONSOLE_LOCK:
+            self._clear()
+            self.active[step_id] = description
+            self._draw()
+
+    def finish_step(self, step_id, line):
+        with _CONSOLE_LOCK:
+            self._clear()
+            self.active.pop(step_id, None)
+            print(line, flush=True)
+            self._draw()
+
+def pipeline_step(step_id, description, action, after=(), speculative=False):
+    """
+    Declares one step of a pipeline.
+    Parameters:
+        step_id: Identifier of the step, unique inside its pipeline
+        description: Description to show with spinner
+        action: Callable taking the description and returning True on success
+        after: Ids of the steps that have to finish before this one starts
+        speculative: Background work whose commands are terminated as soon as another step fails
+    """
+    return {"id": step_id, "description": description, "action": action, "after": list(after),
+            "speculative": speculative}
+
+def order_steps(steps):
+    """
+    Returns the steps in an order that respects their dependencies, keeping the
+    declaration order where the graph allows it. Raises ValueError for duplicate
+    ids, unknown dependencies and cycles.
+    """
+    by_id = {}
+    for step in steps:
+        if step["id"] in by_id:
+            raise ValueError(f"Duplicate pipeline step '{step['id']}'")
+        by_id[step["id"]] = step
+    for step in steps:
+        for dependency in step["after"]:
+            if dependency not in by_id:
+                raise ValueError(f"Step '{step['id']}' depends on unknown step '{dependency}'")
+    ordered = []
+    placed = set()
+    while len(ordered) < len(steps):
+        ready = [step for step in steps if step["id"] not in placed and all(dep in placed for dep in step["after"])]
+        if not ready:
+            cycle = [step["id"] for step in steps if step["id"] not in placed]
+            raise ValueError(f"Pipeline steps form a cycle: {', '.join(cycle)}")
+        ordered.append(ready[0])
+        placed.add(ready[0]["id"])
+    return ordered
+
+def execute_step(step, parent_span=None):
+    """Runs one pipeline step on the current thread and returns its result record"""
+    previous = (getattr(_STEP_STATE, "step_id", None), getattr(_STEP_STATE, "cached", False),
+                getattr(_STEP_STATE, "speculative", False))
+    _STEP_STATE.step_id = step["id"]
+    _STEP_STATE.cached = False
+    _STEP_STATE.speculative = step.get("speculative", False)
+    started = time.time()
+    if step_cancelled(_STEP_STATE.speculative):
+        _STEP_STATE.step_id, _STEP_STATE.cached, _STEP_STATE.speculative = previous
+        return {"ok": step.get("speculative", False), "cached": False, "start": started, "end": started,
+                "cancelled": True}
+    with trace_span(step["id"], "pipeline_step", parent=parent_span) as span:
+        try:
+            success = bool(step["action"](step["description"]))
+        except Exception as e:
+            console_print(f"{RED}Error in step '{step['id']}': {e}{NC}")
+            success = False
+        span["args"].update(ok=success, cached=_STEP_STATE.cached)
+    result = {"ok": success, "cached": _STEP_STATE.cached, "start": started, "end": time.time(),
+              "cancelled": step_cancelled(_STEP_STATE.speculative) and (_STEP_STATE.speculative or not success)}
+    _STEP_STATE.step_id, _STEP_STATE.cached, _STEP_STATE.speculative = previous
+    return result
+
+def step_result_line(step, result):
+    """Formats the final line of a step finished under the progress board"""
+    icon = CHECKMARK if result["ok"] else CROSS
+    if result.get("skipped"):
+        return f"{mark_line(step['description'], '-')}{YELLOW}(skipped){NC}"
+    if result.get("cancelled"):
+        return f"{mark_line(step['description'], icon)}{YELLOW}(cancelled){NC}"
+    cached = f"{BLUE}(cached){NC}" if result["cached"] else ""
+    return f"{mark_line(step['description'], icon)}{cached}"
+
+def run_pipeline(steps, jobs=None):
+    """
+    Runs pipeline steps as a dependency graph. Steps whose dependencies have
+    finished start right away, up to `jobs` (default: --jobs) at the same time.
+    The first failed step stops the pipeline: running commands are terminated
+    and the remaining steps are skipped. With --keep-going only the steps that
+    depend on a failed step are skipped.
+    Returns True when every step succeeded.
+    Parameters:
+        steps: List of steps created with pipeline_step()
+        jobs: Maximum number of steps running at the same time
+    """
+    global _ACTIVE_BOARD
+    ordered = order_steps(steps)
+    jobs = max(1, jobs or OPTIONS["jobs"])
+    keep_going = OPTIONS["keep_going"]
+    results = {}
+    started = time.time()
+    parent_span = current_span()
+
+    def should_skip(step):
+        if failed_here and not keep_going:
+            return True
+        return any(dep in results and not results[dep]["ok"] for dep in step["after"])
+
+    def finish(step, result):
+        results[step["id"]] = result
+        if not result["ok"] and not result.get("cancelled") and not step.get("speculative"):
+            failed_here.append(step["id"])
+            if all(failed["id"] != step["id"] for failed in FAILED_STEPS):
+                FAILED_STEPS.append(step)
+            return True
+        return False
+
+    failed_here = []
+    if _ACTIVE_BOARD is None:
+        _SPECULATION_CANCELLED.clear()
+        _PIPELINE_CANCELLED.clear()
+    if jobs == 1 or _ACTIVE_BOARD is not None:
+        # Sequential run, also used for pipelines nested inside a running step
+        for step in ordered:
+            if should_skip(step):
+                results[step["id"]] = skipped_result()
+                continue
+            finish(step, execute_step(step))
+    else:
+        remaining = list(ordered)
+        running = {}
+        with ProgressBoard() as board, ThreadPoolExecutor(max_workers=jobs) as executor:
+            _ACTIVE_BOARD = board
+            try:
+                while remaining or running:
+                    for step in list(remaining):
+                        if not all(dep in results for dep in step["after"]):
+                            continue
+                        if should_skip(step):
+                            remaining.remove(step)
+                            results[step["id"]] = skipped_result()
+                            continue
+                        if len(running) >= jobs:
+                            break
+                        remaining.remove(step)
+                        board.start_step(step["id"], step["description"])
+                        running[executor.submit(execute_step, step, parent_span)] = step
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        step = running.pop(future)
+                        failed = finish(step, future.result())
+                        board.finish_step(step["id"], step_result_line(step, results[step["id"]]))
+                        if failed:
+                            cancel_running_steps(speculative_only=keep_going)
+            finally:
+                _ACTIVE_BOARD = None
+    skipped = [step["id"] for step in ordered if results[step["id"]].get("skipped")]
+    if skipped:
+        reason = "a step they depend on failed" if keep_going else "a step failed (use --keep-going to run independent steps)"
+        console_print(f"{YELLOW}Skipped {', '.join(skipped)} because {reason}{NC}")
+    report_critical_path(ordered, results, time.time() - started, jobs)
+    return all(result["ok"] for result in results.values())
+
+def skipped_result():
+    """Result record of a step that was not run because of an earlier failure"""
+    now = time.time()
+    return {"ok": False, "cached": False, "skipped": True, "start": now, "end": now}
+
+def step_cancelled(speculative):
+    """Whether a step of the given kind has been told to stop"""
+    return _PIPELINE_CANCELLED.is_set() or (speculative and _SPECULATION_CANCELLED.is_set())
+
+def terminate_processes(processes, grace=TERMINATE_GRACE_SECONDS):
+    """
+    Stops child processes together with everything they started: each runs in
+    its own process group, which gets SIGTERM and, if still alive after grace
+    seconds, SIGKILL. On Windows the process tree is killed with taskkill.
+    """
+    processes = [process for process in processes if process.poll() is None]
+    for process in processes:
+        if platform.system() == "Windows":
+            subprocess.run(["taskkill", "/T", "/F", "/PID", str(process.pid)], capture_output=True)
+            continue
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except OSError:
+            pass
+    deadline = time.time() + grace
+    for process in processes:
+        try:
+            process.wait(timeout=max(0, deadline - time.time()))
+        except subprocess.TimeoutExpired:
+            pass
+        if platform.system() != "Windows":
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+def cancel_running_steps(speculative_only=False):
+    """
+    Stops the commands of running steps (only speculative ones if speculative_only);
+    steps that have not started yet skip their work.
+    """
+    _SPECULATION_CANCELLED.set()
+    if not speculative_only:
+        _PIPELINE_CANCELLED.set()
+    terminate_processes([process for process, speculative in list(_RUNNING_PROCESSES.items())
+                         if speculative or not speculative_only])
+
+def run_warmup_command(cmd_list, description, cwd=None):
+    """
+    Runs a speculative warm-up command. Warm-ups only make later steps faster,
+    so a failed or cancelled warm-up never fails the pipeline.
+    """
+    if not step_cancelled(True):
+        run_flutter_command(cmd_list, description, cwd=cwd)
+    return True
+
+def with_warmup_stage(steps, *build_step_ids):
+    """
+    Adds speculative warm-up steps that run alongside the Dart-side steps so the
+    build steps start warm: `flutter precache --android`, and a Gradle daemon and
+    project configuration warm-up once dependencies are resolved. Sequential
+    runs (--jobs 1) gain nothing from it and are left unchanged.
+    """
+    if OPTIONS["jobs"] == 1:
+        return steps
+    warmups = [pipeline_step("precache", "Precaching Android artifacts...                      ",
+                             lambda d: run_warmup_command(["flutter", "precache", "--android"], d),
+                             speculative=True)]
+    gradlew = "gradlew.bat" if platform.system() == "Windows" else "gradlew"
+    if os.path.isfile(os.path.join("android", gradlew)):
+        after = [step["id"] for step in steps if step["id"] == "pub_get"]
+        warmups.append(pipeline_step("gradle_warmup", "Warming up Gradle daemon...                          ",
+                                     lambda d: run_warmup_command([os.path.join(".", gradlew), "--daemon", "-q", "help"],
+                                                                  d, cwd="android"),
+                                     after=after, speculative=True))
+    for step in steps:
+        if step["id"] in build_step_ids:
+            step["after"] += [warmup["id"] for warmup in warmups]
+    return warmups + steps
+
+def with_build_stages(steps, *build_step_ids):
+    """Adds the optional stages that prepare a release pipeline's build steps"""
+    return with_warmup_stage(with_asset_stage(steps, *build_step_ids), *build_step_ids)
+
+def report_critical_path(ordered, results, wall_time, jobs):
+    """Prints the longest dependency chain of a finished pipeline and how long it took"""
+    if len(ordered) < 2:
+        return
+    finish = {}
+    previous = {}
+    for step in ordered:
+        result = results[step["id"]]
+        slowest = max(step["after"], key=lambda dep: finish[dep], default=None)
+        finish[step["id"]] = (result["end"] - result["start"]) + (finish[slowest] if slowest else 0)
+        previous[step["id"]] = slowest
+    step_id = max(finish, key=finish.get)
+    path_time = finish[step_id]
+    path = []
+    while step_id:
+        path.append(step_id)
+        step_id = previous[step_id]
+    total_time = sum(result["end"] - result["start"] for result in results.values())
+    print(f"\n{BLUE}Critical path: {' → '.join(reversed(path))} ({path_time:.2f}s){NC}")
+    print(f"{BLUE}Wall time: {wall_time:.2f}s | Sum of step times: {total_time:.2f}s | Jobs: {jobs}{NC}")
+
 @timer_decorator
 def build_apk():
     """Build APK (Full Process)"""
     print(f"{YELLOW}Building APK (Full Process)...{NC}\n")
+    if not run_cached_build(pipeline_steps("apk"), BUILD_APK_COMMAND, [MATRIX_TARGETS["apk"][2]],
+                            "Restoring cached APK...                              "):
+        print(f"\n{RED}✗ APK build failed!{NC}")
+        return False
+    return finish_apk()
 
-    # Clean the project
-    run_flutter_command(["flutter", "clean"], "Cleaning project...                                   ")
-    
-    # Get dependencies
-    run_flutter_command(["flutter", "pub", "get"], "Getting dependencies...                              ")
-    
-    # Generate build files
-    run_flutter_command(["dart", "run", "build_runner", "build", "--delete-conflicting-outputs"], "Generating build files...                            ")
-    
-    # Build the APK
-    run_flutter_command([
-        "flutter", "build", "apk", "--release", "--obfuscate", "--target-platform", "android-arm64", "--split-debug-info=./"
-    ], "Building APK...                                      ")
+def finish_apk():
+    """Archives the symbols of a built APK and reports its size"""
+    archive_symbols(glob.glob("*.symbols"))
     print(f"\n{GREEN}✓ APK built successfully!{NC}")
     
     # Display APK size
     display_apk_size()
+    within_budget = report_artifact_sizes(glob.glob("build/app/outputs/flutter-apk/app-release.apk"))
     
     # Open the directory containing the APK
     open_directory("build/app/outputs/flutter-apk/")
+    return within_budget
 
 @timer_decorator
 def build_apk_split_per_abi():
     """Build APK with --split-per-abi"""
     print(f"{YELLOW}Building APK (split-per-abi)...{NC}\n")
-    # Clean the project
-    run_flutter_command(["flutter", "clean"], "Cleaning project...                                   ")
-    # Get dependencies
-    run_flutter_command(["flutter", "pub", "get"], "Getting dependencies...                              ")
-    # Generate build files
-    run_flutter_command(["dart", "run", "build_runner", "build", "--delete-conflicting-outputs"], "Generating build files...                            ")
-    # Build APK with split-per-abi
-    run_flutter_command([
-        "flutter", "build", "apk", "--release", "--split-per-abi", "--obfuscate", "--split-debug-info=./"
-    ], "Building APK (split-per-abi)...                      ")
+    if not run_cached_build(pipeline_steps("apk-split"), BUILD_APK_SPLIT_COMMAND, [MATRIX_TARGETS["apk-split"][2]],
+                            "Restoring cached APKs (split-per-abi)...              "):
+        print(f"\n{RED}✗ APK (split-per-abi) build failed!{NC}")
+        return False
+    return finish_apk_split()
+
+def finish_apk_split():
+    """Archives the symbols of built per-ABI APKs and reports their sizes"""
+    archive_symbols(glob.glob("*.symbols"))
     print(f"\n{GREEN}✓ APK (split-per-abi) built successfully!{NC}")
     # Display APK size
     display_apk_size()
+    within_budget = report_artifact_sizes(sorted(glob.glob("build/app/outputs/flutter-apk/app-*-release.apk")))
     # Open the directory containing the APK
     open_directory("build/app/outputs/flutter-apk/")
+    return within_budget
 
 @timer_decorator
 def build_aab():
     """Build AAB"""
     print(f"{YELLOW}Building AAB...{NC}\n")
-    # Clean the project
-    run_flutter_command(["flutter", "clean"], "Cleaning project...                                   ")
-    # Get dependencies
-    run_flutter_command(["flutter", "pub", "get"], "Getting dependencies...                              ")
-    # Generate build files
-    run_flutter_command(["dart", "run", "build_runner", "build", "--delete-conflicting-outputs"], "Generating build files...                            ")
-    # Build AAB
-    run_flutter_command(["flutter", "build", "appbundle", "--release", "--obfuscate", "--split-debug-info=./"], "Building AAB...                                      ")
+    if not run_cached_build(pipeline_steps("aab"), BUILD_AAB_COMMAND, [MATRIX_TARGETS["aab"][2]],
+                            "Restoring cached AAB...                              "):
+        print(f"\n{RED}✗ AAB build failed!{NC}")
+        return False
+    return finish_aab()
+
+def finish_aab():
+    """Archives the symbols of a built AAB and reports its size"""
+    archive_symbols(glob.glob("*.symbols"))
     print(f"\n{GREEN}✓ AAB built successfully!{NC}")
+    within_budget = report_artifact_sizes(glob.glob("build/app/outputs/bundle/release/*.aab"))
     # Open the directory containing the AAB
     open_directory("build/app/outputs/bundle/release/")
+    return within_budget
+
+def copy_matrix_workspace(workspace):
+    """Copies the project sources needed for an Android build into workspace"""
+    project_root = os.path.abspath(".")
+
+    def ignore(directory, names):
+        skipped = {".gradle"}
+        if os.path.abspath(directory) == project_root:
+            skipped |= MATRIX_WORKSPACE_SKIP
+        return [name for name in names if name in skipped]
+
+    shutil.rmtree(workspace, ignore_errors=True)
+    shutil.copytree(".", workspace, ignore=ignore, symlinks=True)
+
+def build_matrix_target(target, description, report):
+    """
+    Builds one matrix target in an isolated workspace and copies its artifacts
+    back into build/app/outputs and its debug symbols into the symbol archive.
+    """
+    _, cmd_list, artifact_pattern = MATRIX_TARGETS[target]
+    target_dir = os.path.join(MATRIX_DIR, target)
+    workspace = os.path.join(target_dir, "workspace")
+    started = time.time()
+    copy_matrix_workspace(workspace)
+    success = run_flutter_command(cmd_list, description, cwd=workspace)
+    artifacts = []
+    if success:
+        for path in sorted(glob.glob(os.path.join(workspace, artifact_pattern))):
+            destination = os.path.relpath(path, workspace)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            shutil.copy2(path, destination)
+            artifacts.append(destination)
+        archive_symbols(glob.glob(os.path.join(workspace, "*.symbols")))
+    shutil.rmtree(workspace, ignore_errors=True)
+    report[target] = {"ok": success and bool(artifacts), "artifacts": artifacts, "seconds": time.time() - started}
+    return success
+
+def print_matrix_report(targets, report):
+    """Prints every artifact produced by the build matrix with its size"""
+    print(f"\n{BLUE}{'Target':<10} {'Time':>8}  {'Size':>9}  Artifact{NC}")
+    total_bytes = 0
+    for target in targets:
+        entry = report.get(target)
+        if entry is None:
+            print(f"{target:<10} {'-':>8}  {'-':>9}  {YELLOW}not built{NC}")
+            continue
+        if not entry["artifacts"]:
+            print(f"{target:<10} {entry['seconds']:>7.1f}s  {'-':>9}  {RED}no artifact produced{NC}")
+            continue
+        for index, path in enumerate(entry["artifacts"]):
+            size_bytes = os.path.getsize(path)
+            total_bytes += size_bytes
+            time_column = f"{entry['seconds']:>7.1f}s" if index == 0 else " " * 8
+            print(f"{target if index == 0 else '':<10} {time_column}  {size_bytes / 1048576:>6.2f} MB  {path}")
+    print(f"{BLUE}Total artifact size: {total_bytes / 1048576:.2f} MB{NC}")
+
+@timer_decorator
+def build_matrix(targets):
+    """Prepare once, then build several release targets concurrently"""
+    targets = targets or list(MATRIX_TARGETS)
+    unknown = [target for target in targets if target not in MATRIX_TARGETS]
+    if unknown:
+        print(f"{RED}Error: Unknown matrix target(s): {', '.join(unknown)}. Choose from: {', '.join(MATRIX_TARGETS)}{NC}")
+        sys.exit(1)
+    targets = list(dict.fromkeys(targets))
+    print(f"{YELLOW}Building release matrix: {', '.join(targets)}...{NC}\n")
+    report = {}
+    steps = [
+        pipeline_step("clean", "Cleaning project...                                   ",
+                      lambda d: run_flutter_command(["flutter", "clean"], d)),
+        pipeline_step("pub_get", "Getting dependencies...                              ",
+                      lambda d: run_pub_command(["flutter", "pub", "get"], d), after=["clean"]),
+        pipeline_step("gen_l10n", "Generating localizations...                          ",
+                      lambda d: run_codegen_command("gen_l10n", d), after=["pub_get"]),
+        pipeline_step("build_runner", "Generating build files...                            ",
+                      lambda d: run_codegen_command("build_runner", d), after=["pub_get"]),
+    ]
+    for target in targets:
+        steps.append(pipeline_step(
+            f"build_{target}", MATRIX_TARGETS[target][0],
+            lambda d, target=target: build_matrix_target(target, d, report),
+            after=["gen_l10n", "build_runner"],
+        ))
+    run_pipeline(with_build_stages(steps, *[f"build_{target}" for target in targets]))
+    print_matrix_report(targets, report)
+    artifacts = [path for entry in report.values() for path in entry["artifacts"]]
+    within_budget = report_artifact_sizes(artifacts) if artifacts else True
+    if not all(report.get(target, {}).get("ok") for target in targets):
+        print(f"\n{RED}✗ Some matrix targets failed!{NC}")
+        return False
+    if not within_budget:
+        print(f"\n{RED}✗ Release matrix built, but size budgets were exceeded!{NC}")
+        return False
+    print(f"\n{GREEN}✓ Release matrix built successfully!{NC}")
+    return True
 
 def generate_lang():
     """Generate localization files"""
     # Run flutter gen-l10n to generate localization files
-    run_flutter_command(["flutter", "gen-l10n"], "Generating localizations                              ")
+    if not run_pipeline(pipeline_steps("lang")):
+        print(f"\n{CROSS}  Failed to generate localizations.")
+        return False
     print(f"\n{CHECKMARK}  Localizations generated successfully.")
+    return True
 
 def run_build_runner():
     """Run build_runner to generate Dart code"""
     print(f"{YELLOW}Executing build_runner...{NC}  \n")
-    run_flutter_command(["dart", "run", "build_runner", "build", "--delete-conflicting-outputs"], "Running build_runner     ")
+    return run_pipeline(pipeline_steps("db"))
 
 @timer_decorator
 def full_setup():
     """Perform full project setup"""
     print(f"{YELLOW}Performing full setup...{NC}  \n")
-    # Clean the project
-    run_flutter_command(["flutter", "clean"], "Cleaning project...                                  ")
-    # Upgrade dependencies
-    run_flutter_command(["flutter", "pub", "upgrade"], "Upgrading dependencies...                            ")
-    # Run build_runner
-    run_flutter_command(["dart", "run", "build_runner", "build", "--delete-conflicting-outputs"], "Running build_runner...                              ")
-    # Generate localizations
-    run_flutter_command(["flutter", "gen-l10n"], "Generating localizations...                          ")
-    # Refresh dependencies
-    run_flutter_command(["flutter", "pub", "upgrade"], "Refreshing dependencies...                           ")
-    # Analyze code
-    run_flutter_command(["flutter", "analyze"], "Analyzing code...                                    ")
-    # Format code
-    run_flutter_command(["dart", "format", "."], "Formatting code...                                   ")
+    success = run_pipeline(pipeline_steps("setup"))
+    if not success:
+        print(f"\n {RED}✗  Full setup failed.  {NC}")
+        return False
     print(f"\n {GREEN}✓  Full setup completed successfully.  {NC}")
+    return True
 
 def repair_cache():
     """Repair pub cache"""
     print(f"{YELLOW}Repairing pub cache...{NC}\n")
-    run_flutter_command(["flutter", "pub", "cache", "repair"], "Repairing pub cache...                               ")
+    if not run_flutter_command(["flutter", "pub", "cache", "repair"], "Repairing pub cache...                               "):
+        print(f"\n {RED}✗  Failed to repair pub cache.  {NC}")
+        return False
     print(f"\n {GREEN}✓  Pub cache repaired successfully.  {NC}")
+    return True
+
+# Content hashes of verified pub cache packages, to detect later modification
+PUB_CACHE_VERIFY_FILE = os.path.join(TOOL_DIR, "pub_cache_verified.json")
+PUB_DEFAULT_HOSTS = ("https://pub.dev", "https://pub.dartlang.org")
+
+def pub_cache_dir():
+    """Location of the global pub cache (PUB_CACHE or the platform default)"""
+    if os.environ.get("PUB_CACHE"):
+        return os.environ["PUB_CACHE"]
+    if platform.system() == "Windows":
+        return os.path.join(os.environ.get("LOCALAPPDATA", ""), "Pub", "Cache")
+    return os.path.join(os.path.expanduser("~"), ".pub-cache")
+
+def pub_host_directory(url):
+    """Directory name pub uses for a hosted package server inside <cache>/hosted"""
+    url = url.rstrip('/')
+    if url in PUB_DEFAULT_HOSTS:
+        return "pub.dev"
+    url = re.sub(r'^https?://', '', url)
+    return re.sub(r'[<>:"\\/|?*%]', lambda match: f"%{ord(match.group(0))}", url)
+
+def parse_pubspec_lock(path="pubspec.lock"):
+    """
+    Returns {name: {"source", "version", "sha256", "url"}} for every package in pubspec.lock.
+    Only the fields used for cache verification are read.
+    """
+    packages = {}
+    current = None
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if re.match(r'^\S', line):
+                current = None
+                continue
+            package = re.match(r'^  ([\w-]+):\s*$', line)
+            if package:
+                current = packages.setdefault(package.group(1), {})
+                continue
+            field = re.match(r'^\s+(source|version|sha256|url|name):\s*"?([^"\s]*)"?\s*$', line)
+            if current is not None and field:
+                current[field.group(1)] = field.group(2)
+    return packages
+
+def hash_package_dir(path):
+    """Returns (sha256 over relative paths and contents, bytes hashed) of a package directory"""
+    digest = hashlib.sha256()
+    total_bytes = 0
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            digest.update(os.path.relpath(file_path, path).replace(os.sep, '/').encode('utf-8') + b'\0')
+            with open(file_path, 'rb') as file:
+                for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                    digest.update(chunk)
+                    total_bytes += len(chunk)
+    return digest.hexdigest(), total_bytes
+
+def verify_pub_package(cache_dir, name, entry, verified):
+    """
+    Checks one hosted package of the lockfile against the pub cache.
+    Returns (name, key, status, content_hash, bytes_hashed); status is "ok",
+    "missing", "incomplete", "sha256 mismatch" or "modified".
+    """
+    host = pub_host_directory(entry.get("url", PUB_DEFAULT_HOSTS[0]))
+    key = f"{host}/{name}-{entry['version']}"
+    package_dir = os.path.join(cache_dir, "hosted", host, f"{name}-{entry['version']}")
+    if not os.path.isdir(package_dir):
+        return name, key, "missing", None, 0
+    if not os.path.isfile(os.path.join(package_dir, "pubspec.yaml")):
+        return name, key, "incomplete", None, 0
+    hash_path = os.path.join(cache_dir, "hosted-hashes", host, f"{name}-{entry['version']}.sha256")
+    if entry.get("sha256") and os.path.isfile(hash_path):
+        with open(hash_path, 'r', encoding='utf-8') as file:
+            if file.read().strip() != entry["sha256"]:
+                return name, key, "sha256 mismatch", None, 0
+    content_hash, bytes_hashed = hash_package_dir(package_dir)
+    recorded = verified.get(key)
+    if recorded and recorded.get("sha256") == entry.get("sha256") and recorded.get("content") != content_hash:
+        return name, key, "modified", content_hash, bytes_hashed
+    return name, key, "ok", content_hash, bytes_hashed
+
+def verify_pub_packages(cache_dir, packages, verified):
+    """Verifies packages in parallel and returns (results, bytes_hashed, seconds)"""
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=max(OPTIONS["jobs"], os.cpu_count() or 1)) as executor:
+        results = list(executor.map(lambda item: verify_pub_package(cache_dir, item[0], item[1], verified),
+                                    sorted(packages.items())))
+    return results, sum(result[4] for result in results), time.time() - started
 
 @timer_decorator
-def cleanup_project():
-    """Clean up project"""
-    print(f"{YELLOW}Cleaning up project...{NC}\n")
-    run_flutter_command(["flutter", "clean"], "Cleaning project...                                   ")
-    # Get dependencies
-    run_flutter_command(["flutter", "pub", "get"], "Getting dependencies...                              ")
+def verify_cache():
+    """
+    Verifies the hosted packages of pubspec.lock in the pub cache and re-fetches
+    only those that are missing or corrupt, instead of `pub cache repair` of everything.
+    The lockfile sha256 is the hash of the package archive, so it is compared with the
+    hash pub recorded at download time; extracted contents are compared with the
+    content hash recorded by the last successful verification.
+    """
+    if not os.path.isfile("pubspec.lock"):
+        print(f"{RED}pubspec.lock not found! Run `flutter pub get` first.{NC}")
+        return False
+    cache_dir = pub_cache_dir()
+    packages = {name: entry for name, entry in parse_pubspec_lock().items()
+                if entry.get("source") == "hosted" and entry.get("version")}
+    verified = load_json(PUB_CACHE_VERIFY_FILE, {})
+    print(f"{YELLOW}Verifying {len(packages)} hosted package(s) in {cache_dir}...{NC}\n")
+
+    results, bytes_hashed, seconds = verify_pub_packages(cache_dir, packages, verified)
+    throughput = bytes_hashed / seconds if seconds > 0 else 0
+    print(f"Hashed {format_size(bytes_hashed)} in {seconds:.2f}s ({format_size(throughput)}/s)")
 
-    #fix code Issues
-    run_flutter_command(["dart", "fix", "--apply"], "Fixing code issues...                                   ")
+    broken = [result for result in results if result[2] != "ok"]
+    for name, key, status, content_hash, _ in results:
+        if status == "ok":
+            verified[key] = {"sha256": packages[name].get("sha256"), "content": content_hash}
+    for name, key, status, _, _ in broken:
+        print(f"  {RED}{CROSS}{NC} {key}: {status}")
 
-    # Format code
-    run_flutter_command(["dart", "format", "."], "Following dart guidelines...                                   ")
+    if broken:
+        print(f"\n{YELLOW}Re-fetching {len(broken)} package(s)...{NC}")
+        for name, key, _, _, _ in broken:
+            host, package = key.split('/', 1)
+            shutil.rmtree(os.path.join(cache_dir, "hosted", host, package), ignore_errors=True)
+            hash_path = os.path.join(cache_dir, "hosted-hashes", host, f"{package}.sha256")
+            if os.path.isfile(hash_path):
+                os.remove(hash_path)
+            verified.pop(key, None)
+        run_flutter_command(["flutter", "pub", "get"], "Fetching missing packages...                         ")
+        repaired = {name: packages[name] for name, _, _, _, _ in broken}
+        results, _, _ = verify_pub_packages(cache_dir, repaired, verified)
+        broken = [result for result in results if result[2] != "ok"]
+        for name, key, status, content_hash, _ in results:
+            if status == "ok":
+                verified[key] = {"sha256": packages[name].get("sha256"), "content": content_hash}
+    save_json(PUB_CACHE_VERIFY_FILE, verified)
+
+    if broken:
+        print(f"\n{RED}✗ {len(broken)} package(s) could not be repaired: {', '.join(result[1] for result in broken)}{NC}")
+        return False
+    print(f"\n{GREEN}✓ All {len(packages)} hosted package(s) verified.{NC}")
+    return True
 
-    #Upgrade with major version
-    run_flutter_command(["flutter", "pub", "upgrade", "--major-versions"], "Upgrading major versions...                            ")
+@timer_decorator
+def cleanup_project():
+    """Clean up project"""
+    print(f"{YELLOW}Cleaning up project...{NC}\n")
+    success = run_pipeline(pipeline_steps("cleanup"))
+    if not success:
+        print(f"\n{RED}✗ Project cleanup failed!{NC}")
+        return False
     print(f"\n{GREEN}✓ Project cleaned successfully!{NC}")
+    return True
 
 @timer_decorator
 def release_run():
     """Build & Install Release APK"""
     print(f"{YELLOW}Building & Installing Release APK...{NC}\n")
-    run_flutter_command(["flutter", "clean"], "Cleaning project...                                   ")
-    run_flutter_command(["flutter", "pub", "get"], "Getting dependencies...                              ")
-    run_flutter_command(["flutter", "gen-l10n"], "Generating localizations...                          ")
-    run_flutter_command(["dart", "run", "build_runner", "build", "--delete-conflicting-outputs"], "Generating build files...                            ")
-    run_flutter_command(["flutter", "build", "apk", "--release", "--obfuscate", "--target-platform", "android-arm64", "--split-debug-info=./"], "Building APK...                                      ")
+    if not run_cached_build(pipeline_steps("release-run"), BUILD_APK_COMMAND, [MATRIX_TARGETS["apk"][2]],
+                            "Restoring cached APK...                              "):
+        print(f"\n{RED}✗ APK build failed, nothing was installed!{NC}")
+        return False
+    return finish_release_run()
+
+def finish_release_run():
+    """Archives the symbols of a built APK and installs it on all connected devices"""
+    archive_symbols(glob.glob("*.symbols"))
     display_apk_size()
-    install_result = install_apk()
+    install_result = install_apk(glob.glob(MATRIX_TARGETS["apk"][2]))
     if install_result:
         print(f"\n{GREEN}✓ APK built and installed successfully!{NC}")
     else:
         print(f"\n{RED}✗ APK built but install failed!{NC}")
+    return install_result
+
+# adb binary, overridable (e.g. with a fake adb for testing) through the ADB environment variable
+ADB_COMMAND = os.environ.get("ADB", "adb")
+APK_OUTPUT_DIR = "build/app/outputs/flutter-apk"
+APK_ABI_PATTERN = re.compile(r'app-(.+)-release\.apk$')
+APPLICATION_ID_PATTERN = re.compile(r'applicationId\s*=?\s*["\']([\w.]+)["\']')
+NAMESPACE_PATTERN = re.compile(r'namespace\s*=?\s*["\']([\w.]+)["\']')
 
-def install_apk():
+def get_package_name():
     """
-    Installs the built APK on a connected Android device using adb.
-    Tries to install arm64-v8a APK first if available.
-    Handles signature mismatch by uninstalling existing app first.
+    Reads the Android application id from flutter_build.json ("package_name")
+    or android/app/build.gradle(.kts). Returns None if it cannot be found.
     """
-    apk_files = glob.glob("build/app/outputs/flutter-apk/*.apk")
+    configured = load_project_config().get("package_name")
+    if configured:
+        return configured
+    for gradle_file in ("android/app/build.gradle", "android/app/build.gradle.kts"):
+        if not os.path.isfile(gradle_file):
+            continue
+        with open(gradle_file, 'r', encoding='utf-8') as file:
+            content = file.read()
+        match = APPLICATION_ID_PATTERN.search(content) or NAMESPACE_PATTERN.search(content)
+        if match:
+            return match.group(1)
+    return None
+
+def adb(serial, *args):
+    """Runs an adb command against one device and returns the CompletedProcess"""
+    command = [ADB_COMMAND] + (["-s", serial] if serial else []) + list(args)
+    return subprocess.run(command, capture_output=True, text=True, shell=platform.system() == "Windows")
+
+def list_adb_devices():
+    """Returns (serial, state) for every device listed by `adb devices`"""
+    try:
+        result = adb(None, "devices")
+    except OSError:
+        return []
+    devices = []
+    for line in result.stdout.splitlines()[1:]:
+        parts = line.split()
+        if len(parts) >= 2:
+            devices.append((parts[0], parts[1]))
+    return devices
+
+def select_apk_for_abis(apk_files, device_abis):
+    """
+    Picks the split-per-abi APK matching the device's most preferred ABI,
+    falling back to a universal APK. Returns (apk_path, abi) or (None, None).
+    """
+    by_abi = {}
+    universal = None
+    for apk_path in apk_files:
+        match = APK_ABI_PATTERN.search(os.path.basename(apk_path))
+        if match:
+            by_abi[match.group(1)] = apk_path
+        else:
+            universal = apk_path
+    for abi in device_abis:
+        if abi in by_abi:
+            return by_abi[abi], abi
+    return universal, "universal" if universal else None
+
+def installed_apk_hash(serial, package_name):
+    """sha256 of the package's base APK on the device, or None if it is not installed"""
+    result = adb(serial, "shell", "pm", "path", package_name)
+    paths = [line[len("package:"):].strip() for line in result.stdout.splitlines() if line.startswith("package:")]
+    if result.returncode != 0 or not paths:
+        return None
+    base_path = next((path for path in paths if path.endswith("/base.apk")), paths[0])
+    result = adb(serial, "shell", "sha256sum", base_path)
+    fields = result.stdout.split()
+    return fields[0] if result.returncode == 0 and fields else None
+
+def install_on_device(serial, apk_files, package_name, apk_hashes):
+    """
+    Installs the best APK on one device unless the installed APK already matches.
+    Falls back to uninstall + install on failure (e.g. signature mismatch).
+    Returns a result dict for the device table.
+    """
+    started = time.time()
+    result = {"serial": serial, "abi": "-", "apk": "-", "status": "failed", "detail": ""}
+    abilist = adb(serial, "shell", "getprop", "ro.product.cpu.abilist").stdout.strip()
+    device_abis = [abi.strip() for abi in abilist.split(",") if abi.strip()]
+    apk_path, _ = select_apk_for_abis(apk_files, device_abis)
+    result["abi"] = device_abis[0] if device_abis else "?"
+    if not apk_path:
+        result["detail"] = f"no APK for {abilist or 'unknown ABI'}"
+        result["seconds"] = time.time() - started
+        return result
+    result["apk"] = os.path.basename(apk_path)
+    if package_name and not OPTIONS["force"] and installed_apk_hash(serial, package_name) == apk_hashes[apk_path]:
+        result["status"] = "up to date"
+        result["seconds"] = time.time() - started
+        return result
+    with open(os.path.join(LOG_DIR, f"install-{step_slug(serial)}.log"), 'w', encoding='utf-8') as log_file:
+        attempt = adb(serial, "install", "-r", apk_path)
+        log_file.write(attempt.stdout + attempt.stderr)
+        if attempt.returncode != 0 and package_name:
+            log_file.write(f"\n$ uninstall {package_name}\n")
+            uninstall = adb(serial, "uninstall", package_name)
+            log_file.write(uninstall.stdout + uninstall.stderr)
+            attempt = adb(serial, "install", apk_path)
+            log_file.write(attempt.stdout + attempt.stderr)
+            result["detail"] = "reinstalled"
+    if attempt.returncode == 0:
+        result["status"] = "installed"
+    else:
+        output = (attempt.stdout + attempt.stderr).strip().splitlines()
+        result["detail"] = output[-1] if output else f"adb exit {attempt.returncode}"
+    result["seconds"] = time.time() - started
+    return result
+
+def print_install_report(results):
+    """Prints one row per device"""
+    colors = {"installed": GREEN, "up to date": BLUE}
+    print(f"\n{BLUE}{'Device':<24} {'ABI':<12} {'APK':<32} {'Result':<11} {'Time':>7}{NC}")
+    for result in results:
+        color = colors.get(result["status"], RED)
+        print(f"{result['serial']:<24} {result['abi']:<12} {result['apk']:<32} "
+              f"{color}{result['status']:<11}{NC} {result.get('seconds', 0):>6.1f}s  {result['detail']}")
+
+def install_apk(apk_files=None, serials=None):
+    """
+    Installs the built APK on every connected Android device at once, choosing
+    the split-per-abi APK that matches each device's ABI.
+    Devices whose installed APK already has the same hash are skipped.
+    Parameters:
+        apk_files: APKs to choose from (default: all APKs in the build output)
+        serials: Only install on these devices (default: all connected devices)
+    Returns True if every device ended up with the APK.
+    """
+    apk_files = apk_files or glob.glob(os.path.join(APK_OUTPUT_DIR, "*.apk"))
     if not apk_files:
         print(f"{RED}No APK found to install!{NC}")
         return False
-    
-    # Try to install arm64-v8a APK first, otherwise use the first apk
-    target_apk = None
-    for apk_path in apk_files:
-        if "arm64-v8a" in apk_path:
-            target_apk = apk_path
-            break
-    if not target_apk:
-        target_apk = apk_files[0]
-    
-    print(f"{YELLOW}Installing {target_apk}...{NC}")
-    
-    # First try normal install
-    success = run_flutter_command(["adb", "install", "-r", target_apk], "Installing on device...                              ")
-    
-    if not success:
-        print(f"{YELLOW}Installation failed, trying to uninstall existing app first...{NC}")
-        # Try to uninstall existing app first
-        run_flutter_command(["adb", "uninstall", "com.royalcourtbd.dhaka_bus"], "Uninstalling existing app...                        ")
-        # Then try to install again
-        success = run_flutter_command(["adb", "install", target_apk], "Reinstalling on device...                           ")
-    
+    devices = list_adb_devices()
+    if serials:
+        devices = [device for device in devices if device[0] in serials]
+    ready = [serial for serial, state in devices if state == "device"]
+    for serial, state in devices:
+        if state != "device":
+            print(f"{YELLOW}Skipping {serial} ({state}){NC}")
+    if not ready:
+        print(f"{RED}No connected Android device found!{NC}")
+        return False
+    package_name = get_package_name()
+    if not package_name:
+        print(f"{YELLOW}Could not determine the application id; installs will not be skipped or retried{NC}")
+    apk_hashes = {apk_path: hash_file(apk_path) for apk_path in apk_files}
+    # Every device logs its install to its own file in LOG_DIR
+    os.makedirs(LOG_DIR, exist_ok=True)
+
+    print(f"{YELLOW}Installing on {len(ready)} device(s)...{NC}")
+    with ThreadPoolExecutor(max_workers=len(ready)) as executor:
+        results = list(executor.map(lambda serial: install_on_device(serial, apk_files, package_name, apk_hashes), ready))
+    print_install_report(results)
+    return all(result["status"] in ("installed", "up to date") for result in results)
+
+@timer_decorator
+def install_command(serials):
+    """
+    Installs the already built APK(s) on connected devices.
+    Parameters:
+        serials: Optional device serials to restrict the install to
+    """
+    success = install_apk(serials=serials)
+    if success:
+        print(f"\n{GREEN}✓ APK installed on all devices!{NC}")
+    else:
+        print(f"\n{RED}✗ Install failed on at least one device!{NC}")
     return success
 
+def pod_fingerprint():
+    """
+    Hashes of the inputs of `pod install`: ios/Podfile, the iOS plugin list of
+    .flutter-plugins-dependencies (without its creation timestamp) and ios/Podfile.lock
+    """
+    plugins = load_json(".flutter-plugins-dependencies", {}).get("plugins", {}).get("ios", [])
+    return {
+        "podfile": hash_file(POD_PODFILE),
+        "plugins": hashlib.sha256(json.dumps(plugins, sort_keys=True).encode('utf-8')).hexdigest(),
+        "lockfile": hash_file(POD_LOCKFILE),
+    }
+
 @timer_decorator
-def update_pods():
-    """Update iOS pods"""
+def update_pods(args=()):
+    """
+    Update iOS pods, doing only as much as the changed inputs need:
+    nothing when Podfile, iOS plugins and Podfile.lock are unchanged and the Pods
+    sandbox matches the lock, `pod install` when only plugins or the lock changed,
+    and `pod install --repo-update` when the Podfile changed.
+    Parameters:
+        args: `--reset` deletes Podfile.lock and runs a full repo update first
+    """
+    reset = "--reset" in args
     print(f"{YELLOW}Updating iOS pods...{NC}\n")
-    # Navigate to iOS directory
-    current_dir = os.getcwd()
-    os.chdir("ios")
-    # Delete Podfile.lock
+    if not os.path.isfile(POD_PODFILE):
+        print(f"{RED}No {POD_PODFILE} found!{NC}")
+        return False
+    recorded = {} if OPTIONS["force"] or reset else load_json(POD_FINGERPRINT_FILE, {})
+    current = pod_fingerprint()
+    sandbox_in_sync = current["lockfile"] is not None and hash_file(POD_MANIFEST) == current["lockfile"]
+
+    if reset:
+        if os.path.isfile(POD_LOCKFILE):
+            os.remove(POD_LOCKFILE)
+            print(mark_line("Removing Podfile.lock                                 ", CHECKMARK))
+        success = (run_flutter_command(["pod", "repo", "update"], "Updating pod repository                               ") and
+                   run_flutter_command(["pod", "install"], "Installing pods                                       ", cwd="ios"))
+    elif recorded == current and sandbox_in_sync:
+        report_cache_hit("Installing pods                                       ", ["pod", "install"])
+        success = True
+    elif recorded.get("podfile") != current["podfile"] or current["lockfile"] is None:
+        success = run_flutter_command(["pod", "install", "--repo-update"],
+                                      "Installing pods (with repo update)                   ", cwd="ios")
+    else:
+        success = run_flutter_command(["pod", "install"], "Installing pods                                       ", cwd="ios")
+
+    if not success:
+        print(f"\n{RED}✗ Failed to update iOS pods!{NC}")
+        return False
+    save_json(POD_FINGERPRINT_FILE, pod_fingerprint())
+    print(f"\n{GREEN}✓ iOS pods updated successfully!{NC}")
+    return True
+
+# ============================================================================
+# INCREMENTAL CHECK FUNCTIONS
+# ============================================================================
+
+# Per-file hashes of Dart files last seen formatted / free of diagnostics
+CHECK_CACHE_FILE = os.path.join(TOOL_DIR, "check_cache.json")
+DIAGNOSTICS_FILE = os.path.join(TOOL_DIR, "diagnostics.json")
+DEFAULT_BASE_REFS = ["origin/main", "origin/master", "main", "master"]
+DART_DIRECTIVE_PATTERN = re.compile(r'''^\s*(?:import|export|part)\s+['"]([^'"]+)['"]''', re.M)
+# `dart analyze --format=machine`: SEVERITY|TYPE|CODE|FILE|LINE|COLUMN|LENGTH|MESSAGE
+MACHINE_DIAGNOSTIC_PATTERN = re.compile(r'^(INFO|WARNING|ERROR)\|(\w+)\|(\w+)\|(.+?)\|(\d+)\|(\d+)\|(\d+)\|(.*)$')
+
+def git_output(args):
+    """Returns the stdout lines of a git command, or None if it failed"""
     try:
-        os.remove("Podfile.lock")
-        # Use platform-specific dummy process for the loading animation
-        if platform.system() == "Windows":
-            run_flutter_command(["timeout", "/t", "1", "/nobreak"], "Removing Podfile.lock                                 ")
+        result = subprocess.run(["git"] + args, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.splitlines() if result.returncode == 0 else None
+
+def resolve_base_ref():
+    """The ref changes are compared against: --base, "base_ref" in the config, or the default branch"""
+    candidates = [OPTIONS["base"] or load_project_config().get("base_ref")] + DEFAULT_BASE_REFS
+    for ref in filter(None, candidates):
+        if git_output(["rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"]):
+            return ref
+    return "HEAD"
+
+def project_dart_files():
+    """Hand-written Dart files under lib/ and test/"""
+    files = []
+    for directory in ("lib", "test"):
+        for root, _, names in os.walk(directory):
+            files += [os.path.join(root, name).replace(os.sep, '/') for name in sorted(names)
+                      if name.endswith('.dart') and not name.endswith(GENERATED_DART_SUFFIXES)]
+    return files
+
+def changed_dart_files():
+    """
+    Dart files changed since the merge base with the base ref, including uncommitted
+    and untracked ones. Outside a git repository every project Dart file is a candidate.
+    """
+    base = resolve_base_ref()
+    merge_base = git_output(["merge-base", base, "HEAD"])
+    changed = git_output(["diff", "--name-only", "--diff-filter=d", merge_base[0] if merge_base else base])
+    untracked = git_output(["ls-files", "--others", "--exclude-standard"])
+    if changed is None or untracked is None:
+        return project_dart_files()
+    return sorted(path for path in set(changed + untracked)
+                  if path.endswith('.dart') and not path.endswith(GENERATED_DART_SUFFIXES) and os.path.isfile(path))
+
+def direct_importers(paths):
+    """Project Dart files that import, export or include one of paths as a part"""
+    package_name = read_simple_yaml("pubspec.yaml").get("name")
+    targets = {os.path.normpath(path) for path in paths}
+    importers = set()
+    for path in project_dart_files():
+        with open(path, 'r', encoding='utf-8', errors='ignore') as file:
+            content = file.read()
+        for uri in DART_DIRECTIVE_PATTERN.findall(content):
+            if package_name and uri.startswith(f"package:{package_name}/"):
+                resolved = os.path.join("lib", uri[len(f"package:{package_name}/"):])
+            elif ':' in uri:
+                continue
+            else:
+                resolved = os.path.join(os.path.dirname(path), uri)
+            if os.path.normpath(resolved) in targets:
+                importers.add(path)
+                break
+    return sorted(importers - set(paths))
+
+def update_check_cache(section, entries, drop=()):
+    """Records file hashes in one section ("formatted" or "clean") of the check cache"""
+    with _STATE_LOCK:
+        cache = load_json(CHECK_CACHE_FILE, {})
+        cache.setdefault(section, {}).update(entries)
+        for path in drop:
+            cache[section].pop(path, None)
+        save_json(CHECK_CACHE_FILE, cache)
+
+def stale_files(section, paths):
+    """The paths whose current hash is not recorded in a check cache section"""
+    with _STATE_LOCK:
+        recorded = load_json(CHECK_CACHE_FILE, {}).get(section, {})
+    return [path for path in paths if recorded.get(path) != hash_file(path)]
+
+def parse_diagnostics(log_path):
+    """Reads the machine-format diagnostics of a `dart analyze` log"""
+    diagnostics = []
+    with open(log_path, 'r', encoding='utf-8', errors='ignore') as file:
+        for line in file:
+            match = MACHINE_DIAGNOSTIC_PATTERN.match(line.strip())
+            if not match:
+                continue
+            severity, kind, code, path, line_number, column, _, message = match.groups()
+            path = os.path.relpath(path) if os.path.isabs(path) else path
+            diagnostics.append({"file": path.replace(os.sep, '/'), "line": int(line_number), "column": int(column),
+                                "severity": severity.lower(), "type": kind.lower(), "code": code.lower(),
+                                "message": message.replace('\\|', '|')})
+    return diagnostics
+
+def print_diagnostics(diagnostics):
+    """Prints one line per diagnostic, errors first"""
+    colors = {"error": RED, "warning": YELLOW, "info": BLUE}
+    order = {"error": 0, "warning": 1, "info": 2}
+    for diagnostic in sorted(diagnostics, key=lambda d: (order[d["severity"]], d["file"], d["line"])):
+        console_print(f"  {colors[diagnostic['severity']]}{diagnostic['severity']:<7}{NC} "
+                      f"{diagnostic['file']}:{diagnostic['line']}:{diagnostic['column']}  "
+                      f"{diagnostic['code']}  {diagnostic['message']}")
+
+def format_changed(description):
+    """Formats the changed Dart files that were not already formatted at their current content"""
+    paths = stale_files("formatted", changed_dart_files())
+    if not paths:
+        report_cache_hit(description, ["dart", "format"])
+        return True
+    success = run_flutter_command(["dart", "format"] + paths, description)
+    if success:
+        update_check_cache("formatted", {path: hash_file(path) for path in paths})
+    return success
+
+def analyze_changed(description):
+    """
+    Analyzes the changed Dart files that are not known to be clean, together with
+    their direct importers, and writes structured diagnostics to DIAGNOSTICS_FILE.
+    """
+    changed = stale_files("clean", changed_dart_files())
+    if not changed:
+        save_json(DIAGNOSTICS_FILE, [])
+        report_cache_hit(description, ["dart", "analyze"])
+        return True
+    paths = changed + direct_importers(changed)
+    success = run_flutter_command(["dart", "analyze", "--format=machine"] + paths, description)
+    diagnostics = parse_diagnostics(os.path.join(LOG_DIR, f"{step_slug(description)}.log"))
+    save_json(DIAGNOSTICS_FILE, diagnostics)
+    print_diagnostics(diagnostics)
+    flagged = {diagnostic["file"] for diagnostic in diagnostics}
+    clean = [path for path in paths if path not in flagged] if success or diagnostics else []
+    update_check_cache("clean", {path: hash_file(path) for path in clean}, drop=flagged)
+    return success
+
+def analyze_step(description):
+    """`flutter analyze` over the whole project, or only changed files with --changed"""
+    if OPTIONS["changed"]:
+        return analyze_changed(description)
+    return run_flutter_command(["flutter", "analyze"], description)
+
+def format_step(description):
+    """`dart format .` over the whole project, or only changed files with --changed"""
+    if OPTIONS["changed"]:
+        return format_changed(description)
+    return run_flutter_command(["dart", "format", "."], description)
+
+@timer_decorator
+def check_changed():
+    """Formats and analyzes only the Dart files changed against the base ref"""
+    OPTIONS["changed"] = True
+    print(f"{YELLOW}Checking files changed since {resolve_base_ref()}...{NC}\n")
+    success = run_pipeline([
+        pipeline_step("format", "Formatting changed files...                          ", format_changed),
+        pipeline_step("analyze", "Analyzing changed files...                           ", analyze_changed,
+                      after=["format"]),
+    ])
+    if success:
+        print(f"\n{GREEN}✓ No issues in changed files.{NC}")
+    else:
+        print(f"\n{RED}✗ Issues found (see {DIAGNOSTICS_FILE}){NC}")
+    return success
+
+# ============================================================================
+# ASSET OPTIMIZATION FUNCTIONS
+# ============================================================================
+
+# Directories whose images go into the app, as glob patterns
+ASSET_DIRS = ["assets/images", "assets/svg", "web/icons", "android/app/src/main/res/mipmap-*"]
+# Hashes of files that are already optimal, so repeat runs skip them
+ASSET_CACHE_FILE = os.path.join(TOOL_DIR, "asset_cache.json")
+# Bump when the optimizers change so previously cached results are re-checked
+ASSET_OPTIMIZER_VERSION = 1
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# Metadata chunks that do not affect how a PNG is rendered
+PNG_STRIP_CHUNKS = {b'tEXt', b'zTXt', b'iTXt', b'tIME', b'pHYs', b'bKGD', b'hIST', b'sPLT', b'eXIf',
+                    b'dSIG', b'oFFs', b'pCAL', b'sCAL'}
+PNG_CRITICAL_CHUNKS = {b'IHDR', b'PLTE', b'IDAT', b'IEND'}
+SVG_EDITOR_NAMESPACES = ("inkscape", "sodipodi", "sketch", "serif")
+
+def asset_optimization_enabled():
+    """Whether build pipelines get the asset optimization stage (--optimize-assets or config)"""
+    return OPTIONS["optimize_assets"] or bool(load_project_config().get("optimize_assets"))
+
+def png_chunk(chunk_type, data):
+    """Encodes one PNG chunk with its length and CRC"""
+    return (len(data).to_bytes(4, 'big') + chunk_type + data +
+            (zlib.crc32(chunk_type + data) & 0xffffffff).to_bytes(4, 'big'))
+
+def optimize_png_data(data):
+    """
+    Losslessly shrinks PNG data: drops metadata chunks and re-deflates the image
+    data at maximum compression. Returns None for data that must not be touched
+    (not a PNG, animated, or with unknown critical chunks).
+    """
+    if not data.startswith(PNG_SIGNATURE):
+        return None
+    chunks = []
+    position = len(PNG_SIGNATURE)
+    while position + 12 <= len(data):
+        length = int.from_bytes(data[position:position + 4], 'big')
+        chunk_type = data[position + 4:position + 8]
+        chunks.append((chunk_type, data[position + 8:position + 8 + length]))
+        position += length + 12
+        if chunk_type == b'IEND':
+            break
+    types = {chunk_type for chunk_type, _ in chunks}
+    if b'acTL' in types or any(chunk_type[:1].isupper() and chunk_type not in PNG_CRITICAL_CHUNKS
+                               for chunk_type in types):
+        return None
+
+    image_data = b''.join(chunk_data for chunk_type, chunk_data in chunks if chunk_type == b'IDAT')
+    raw = zlib.decompress(image_data)
+    for strategy in (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED):
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9, strategy)
+        candidate = compressor.compress(raw) + compressor.flush()
+        if len(candidate) < len(image_data):
+            image_data = candidate
+
+    output = [PNG_SIGNATURE]
+    for chunk_type, chunk_data in chunks:
+        if chunk_type in PNG_STRIP_CHUNKS:
+            continue
+        if chunk_type == b'IDAT':
+            if image_data is not None:
+                output.append(png_chunk(b'IDAT', image_data))
+                image_data = None
+            continue
+        output.append(png_chunk(chunk_type, chunk_data))
+    return b''.join(output)
+
+def optimize_svg_data(data):
+    """
+    Minifies SVG markup: removes comments, <metadata>, editor-specific elements and
+    attributes, and whitespace between tags (unless the file contains <text>).
+    """
+    text = data.decode('utf-8')
+    text = re.sub(r'<!--.*?-->', '', text, flags=re.S)
+    text = re.sub(r'<metadata\b.*?</metadata>|<metadata\b[^>]*/>', '', text, flags=re.S)
+    for namespace in SVG_EDITOR_NAMESPACES:
+        text = re.sub(rf'<{namespace}:(\w+)\b[^>]*/>|<{namespace}:(\w+)\b.*?</{namespace}:\2>', '', text, flags=re.S)
+        text = re.sub(rf'\s+(xmlns:)?{namespace}(:[\w-]+)?="[^"]*"', '', text)
+    if '<text' not in text:
+        text = re.sub(r'>\s+<', '><', text)
+    text = re.sub(r'[ \t]*\n\s*', ' ', text.strip())
+    return text.encode('utf-8')
+
+def optimize_asset(path):
+    """
+    Optimizes one image in place (run in a worker process).
+    Returns (path, bytes_before, bytes_after, error).
+    """
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+        optimized = optimize_png_data(data) if path.endswith('.png') else optimize_svg_data(data)
+        if optimized is None or len(optimized) >= len(data):
+            return path, len(data), len(data), None
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(optimized)
+        shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+        return path, len(data), len(optimized), None
+    except (OSError, ValueError, zlib.error) as e:
+        return path, 0, 0, str(e)
+
+def collect_asset_files():
+    """PNG and SVG files in ASSET_DIRS; 9-patch images are left alone"""
+    files = []
+    for pattern in ASSET_DIRS:
+        for directory in sorted(glob.glob(pattern)):
+            for root, _, names in os.walk(directory):
+                files += [os.path.join(root, name) for name in sorted(names)
+                          if name.endswith(('.png', '.svg')) and not name.endswith('.9.png')]
+    return files
+
+def optimize_assets():
+    """
+    Optimizes every asset image whose content hash is not already known to be
+    optimal, across a process pool. Returns (results, skipped_count, error_count).
+    """
+    cache = load_json(ASSET_CACHE_FILE, {})
+    if cache.get("version") != ASSET_OPTIMIZER_VERSION:
+        cache = {"version": ASSET_OPTIMIZER_VERSION, "optimal": {}}
+    files = collect_asset_files()
+    hashes = {path: hash_file(path) for path in files}
+    pending = [path for path in files if hashes[path] not in cache["optimal"]]
+    results = []
+    if pending:
+        with ProcessPoolExecutor(max_workers=min(OPTIONS["jobs"], len(pending))) as executor:
+            results = list(executor.map(optimize_asset, pending, chunksize=8))
+    errors = 0
+    for path, before, after, error in results:
+        if error:
+            errors += 1
+            continue
+        cache["optimal"][hash_file(path) if after < before else hashes[path]] = after
+    save_json(ASSET_CACHE_FILE, cache)
+    return results, len(files) - len(pending), errors
+
+def print_asset_report(results, skipped):
+    """Prints the bytes saved per optimized file and in total"""
+    saved_results = [result for result in results if not result[3] and result[2] < result[1]]
+    for path, before, after, _ in sorted(saved_results, key=lambda result: result[2] - result[1]):
+        print(f"  {format_size(before - after):>10}  {(before - after) / before:>5.1%}  {path}")
+    for path, _, _, error in results:
+        if error:
+            print(f"  {RED}{CROSS}{NC} {path}: {error}")
+    before_total = sum(result[1] for result in results)
+    saved_total = sum(result[1] - result[2] for result in saved_results)
+    print(f"\n{BLUE}Optimized {len(saved_results)} of {len(results)} checked file(s), "
+          f"{skipped} unchanged since the last run. Saved {format_size(saved_total)}"
+          f"{f' ({saved_total / before_total:.1%})' if before_total else ''}.{NC}")
+
+def optimize_assets_step(description):
+    """Pipeline step wrapper around optimize_assets()"""
+    with trace_span(step_name(description), "step_command", argv=["optimize_assets"], cached=False) as span:
+        results, skipped, errors = optimize_assets()
+        span["args"]["exit_code"] = 1 if errors else 0
+    saved = sum(before - after for _, before, after, error in results if not error)
+    summary = f"{BLUE}saved {format_size(saved)}, {skipped} cached{NC}"
+    if _ACTIVE_BOARD is not None:
+        console_print(f"  {step_name(description)}: {summary}")
+    else:
+        console_print(f"{mark_line(description, CROSS if errors else CHECKMARK)}{summary}")
+    return not errors
+
+def with_asset_stage(steps, *build_step_ids):
+    """Adds the asset optimization stage in front of a pipeline's build steps when enabled"""
+    if not asset_optimization_enabled():
+        return steps
+    for step in steps:
+        if step["id"] in build_step_ids:
+            step["after"].append("optimize_assets")
+    return steps + [pipeline_step("optimize_assets", "Optimizing assets...                                 ",
+                                  optimize_assets_step)]
+
+@timer_decorator
+def optimize_assets_command():
+    """Losslessly recompresses PNGs and minifies SVGs in the asset directories"""
+    print(f"{YELLOW}Optimizing assets...{NC}\n")
+    results, skipped, errors = optimize_assets()
+    print_asset_report(results, skipped)
+    return not errors
+
+# ============================================================================
+# WEB BUILD FUNCTIONS
+# ============================================================================
+
+WEB_OUTPUT_DIR = "build/web"
+# Content hash, size and precompressed size of every file of the web build
+WEB_MANIFEST_FILE = os.path.join(WEB_OUTPUT_DIR, "asset-hashes.json")
+# Compressed copies of previously seen files, keyed by content hash (survives `flutter clean`)
+WEB_GZIP_CACHE_DIR = os.path.join(TOOL_DIR, "web_gzip")
+WEB_COMPRESSIBLE_SUFFIXES = ('.js', '.mjs', '.css', '.html', '.json', '.svg', '.wasm', '.map', '.txt',
+                             '.xml', '.ttf', '.otf', '.ico', '.frag')
+# Smaller files or files that do not shrink below this ratio are served uncompressed
+WEB_GZIP_MIN_SIZE = 1024
+WEB_GZIP_MAX_RATIO = 0.95
+
+def precompress_web_file(path, content_hash):
+    """
+    Writes path.gz next to a web build file, reusing a cached compressed copy
+    with the same content hash (run in a worker process).
+    Returns (path, gzip_size or None, reused).
+    """
+    cached_path = os.path.join(WEB_GZIP_CACHE_DIR, f"{content_hash}.gz")
+    reused = os.path.isfile(cached_path)
+    if not reused:
+        with open(path, 'rb') as file:
+            data = file.read()
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        if len(compressed) > len(data) * WEB_GZIP_MAX_RATIO:
+            return path, None, False
+        with open(f"{cached_path}.tmp", 'wb') as file:
+            file.write(compressed)
+        os.replace(f"{cached_path}.tmp", cached_path)
+    shutil.copyfile(cached_path, f"{path}.gz")
+    return path, os.path.getsize(cached_path), reused
+
+def precompress_web_build():
+    """
+    Gzips every eligible file of the web build across a process pool, skipping files
+    whose .gz already matches their content hash, and writes the content-hashed
+    asset manifest. Returns (manifest entries, files compressed, cached copies reused).
+    """
+    previous = load_json(WEB_MANIFEST_FILE, {}).get("files", {})
+    files = {}
+    for root, _, names in os.walk(WEB_OUTPUT_DIR):
+        for name in names:
+            path = os.path.join(root, name)
+            if not name.endswith('.gz') and path != WEB_MANIFEST_FILE:
+                files[os.path.relpath(path, WEB_OUTPUT_DIR).replace(os.sep, '/')] = path
+    entries = {relative: {"sha256": hash_file(path), "size": os.path.getsize(path), "gzip_size": None}
+               for relative, path in sorted(files.items())}
+
+    pending = []
+    for relative, entry in entries.items():
+        path = files[relative]
+        if not relative.endswith(WEB_COMPRESSIBLE_SUFFIXES) or entry["size"] < WEB_GZIP_MIN_SIZE:
+            continue
+        old = previous.get(relative, {})
+        if old.get("sha256") == entry["sha256"] and (not old.get("gzip_size") or os.path.isfile(f"{path}.gz")):
+            # Unchanged since the last run: already compressed, or known not to shrink
+            entry["gzip_size"] = old.get("gzip_size")
+            continue
+        pending.append(relative)
+    os.makedirs(WEB_GZIP_CACHE_DIR, exist_ok=True)
+    compressed = reused = 0
+    if pending:
+        with ProcessPoolExecutor(max_workers=min(OPTIONS["jobs"], len(pending))) as executor:
+            futures = {relative: executor.submit(precompress_web_file, files[relative], entries[relative]["sha256"])
+                       for relative in pending}
+            for relative, future in futures.items():
+                _, entries[relative]["gzip_size"], from_cache = future.result()
+                reused += from_cache
+                compressed += bool(entries[relative]["gzip_size"]) and not from_cache
+
+    # Compressed copies of files that are no longer part of the build are dropped
+    in_use = {f"{entry['sha256']}.gz" for entry in entries.values() if entry["gzip_size"]}
+    for name in os.listdir(WEB_GZIP_CACHE_DIR):
+        if name not in in_use:
+            os.remove(os.path.join(WEB_GZIP_CACHE_DIR, name))
+    save_json(WEB_MANIFEST_FILE, {"generated": time.time(), "files": entries})
+    return entries, compressed, reused
+
+def print_web_report(entries):
+    """Prints raw vs. transfer size (gzip where precompressed) per file type"""
+    by_type = {}
+    for relative, entry in entries.items():
+        suffix = os.path.splitext(relative)[1].lower() or "(none)"
+        totals = by_type.setdefault(suffix, [0, 0, 0])
+        totals[0] += 1
+        totals[1] += entry["size"]
+        totals[2] += entry["gzip_size"] or entry["size"]
+    print(f"\n{BLUE}{'Type':<10} {'Files':>6} {'Raw':>11} {'Transfer':>11} {'Ratio':>7}{NC}")
+    for suffix, (count, raw, transfer) in sorted(by_type.items(), key=lambda item: -item[1][1]):
+        ratio = f"{transfer / raw:.0%}" if raw else "-"
+        print(f"{suffix:<10} {count:>6} {format_size(raw):>11} {format_size(transfer):>11} {ratio:>7}")
+    raw_total = sum(totals[1] for totals in by_type.values())
+    transfer_total = sum(totals[2] for totals in by_type.values())
+    print(f"{'Total':<10} {len(entries):>6} {format_size(raw_total):>11} {format_size(transfer_total):>11}")
+
+def precompress_web_step(description):
+    """Pipeline step wrapper around precompress_web_build()"""
+    with trace_span(step_name(description), "step_command", argv=["precompress_web"], cached=False) as span:
+        entries, compressed, reused = precompress_web_build()
+        span["args"]["exit_code"] = 0
+    summary = f"{BLUE}{compressed} compressed, {reused} reused, {len(entries)} file(s) in manifest{NC}"
+    if _ACTIVE_BOARD is not None:
+        console_print(f"  {step_name(description)}: {summary}")
+    else:
+        console_print(f"{mark_line(description, CHECKMARK)}{summary}")
+    return True
+
+@timer_decorator
+def build_web():
+    """Build release web app, precompress it and write its asset manifest"""
+    print(f"{YELLOW}Building web release...{NC}\n")
+    if not run_pipeline(pipeline_steps("web")):
+        print(f"\n{RED}✗ Web build failed!{NC}")
+        return False
+    return finish_web()
+
+def finish_web():
+    """Reports the precompressed web build"""
+    print_web_report(load_json(WEB_MANIFEST_FILE, {}).get("files", {}))
+    print(f"\n{GREEN}✓ Web app built successfully! Asset manifest: {WEB_MANIFEST_FILE}{NC}")
+    return True
+
+# ============================================================================
+# SYMBOL ARCHIVE FUNCTIONS
+# ============================================================================
+
+# Compressed split-debug-info symbols of every release build, one zip per build
+SYMBOLS_ARCHIVE_DIR = os.path.join(TOOL_DIR, "symbols")
+SYMBOLS_INDEX_FILE = os.path.join(SYMBOLS_ARCHIVE_DIR, "index.json")
+SYMBOLS_OUTPUT_DIR = "build/symbols"
+SHT_NOTE = 7
+NT_GNU_BUILD_ID = 3
+
+def elf_build_id(path):
+    """Returns the GNU build ID of an ELF file (such as app.*.symbols) as hex, or None"""
+    try:
+        with open(path, 'rb') as file:
+            header = file.read(64)
+            if header[:4] != b'\x7fELF':
+                return None
+            is_64_bit = header[4] == 2
+            endian = '<' if header[5] == 1 else '>'
+            if is_64_bit:
+                section_offset = struct.unpack_from(endian + 'Q', header, 0x28)[0]
+                entry_size, entry_count = struct.unpack_from(endian + 'HH', header, 0x3A)
+            else:
+                section_offset = struct.unpack_from(endian + 'I', header, 0x20)[0]
+                entry_size, entry_count = struct.unpack_from(endian + 'HH', header, 0x2E)
+            for index in range(entry_count):
+                file.seek(section_offset + index * entry_size)
+                section = file.read(entry_size)
+                if is_64_bit:
+                    section_type = struct.unpack_from(endian + 'I', section, 4)[0]
+                    offset, size = struct.unpack_from(endian + 'QQ', section, 0x18)
+                else:
+                    section_type = struct.unpack_from(endian + 'I', section, 4)[0]
+                    offset, size = struct.unpack_from(endian + 'II', section, 0x10)
+                if section_type != SHT_NOTE:
+                    continue
+                file.seek(offset)
+                notes = file.read(size)
+                position = 0
+                while position + 12 <= len(notes):
+                    name_size, desc_size, note_type = struct.unpack_from(endian + 'III', notes, position)
+                    name_start = position + 12
+                    desc_start = name_start + (name_size + 3) // 4 * 4
+                    if note_type == NT_GNU_BUILD_ID and notes[name_start:name_start + name_size] == b'GNU\0':
+                        return notes[desc_start:desc_start + desc_size].hex()
+                    position = desc_start + (desc_size + 3) // 4 * 4
+    except (OSError, struct.error):
+        return None
+    return None
+
+def symbols_abi(path):
+    """ABI name of a symbols file: app.android-arm64.symbols -> android-arm64"""
+    name = os.path.basename(path)
+    return name[len("app."):-len(".symbols")] if name.startswith("app.") else name[:-len(".symbols")]
+
+def archive_symbols(paths):
+    """
+    Moves split-debug-info symbols into a compressed archive keyed by the pubspec
+    version and a build ID derived from the symbols' ELF build IDs, and records
+    every file in the index. Builds that are already archived are not stored twice.
+    Returns the index entry, or None if there was nothing to archive.
+    """
+    paths = sorted(paths)
+    version = get_version_from_pubspec(include_build_number=True) if paths else None
+    if not version:
+        return None
+    files = {}
+    for path in paths:
+        files[symbols_abi(path)] = {"member": os.path.basename(path), "size": os.path.getsize(path),
+                                    "elf_build_id": elf_build_id(path) or hash_file(path)}
+    build_id = hashlib.sha256("".join(sorted(entry["elf_build_id"] for entry in files.values()))
+                              .encode('utf-8')).hexdigest()[:12]
+    archive_path = os.path.join(SYMBOLS_ARCHIVE_DIR, version, f"{build_id}.zip")
+
+    with _STATE_LOCK:
+        index = load_json(SYMBOLS_INDEX_FILE, {"builds": []})
+        entry = next((build for build in index["builds"]
+                      if build["version"] == version and build["build_id"] == build_id), None)
+        if entry is None:
+            os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+            with zipfile.ZipFile(f"{archive_path}.tmp", 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+                for path in paths:
+                    archive.write(path, os.path.basename(path))
+            os.replace(f"{archive_path}.tmp", archive_path)
+            with zipfile.ZipFile(archive_path) as archive:
+                for info in archive.infolist():
+                    files[symbols_abi(info.filename)]["compressed_size"] = info.compress_size
+            entry = {"version": version, "build_id": build_id, "archive": os.path.relpath(archive_path, SYMBOLS_ARCHIVE_DIR),
+                     "created": time.time(), "files": files}
+            index["builds"].append(entry)
+            save_json(SYMBOLS_INDEX_FILE, index)
+    for path in paths:
+        os.remove(path)
+    console_print(f"{BLUE}Symbols for {', '.join(sorted(files))} archived: {version} build {build_id}{NC}")
+    return entry
+
+def find_symbols(version, abi, build_id=None):
+    """Returns (index entry, file entry) of the newest archived build matching version/abi, or (None, None)"""
+    builds = load_json(SYMBOLS_INDEX_FILE, {"builds": []})["builds"]
+    for build in sorted(builds, key=lambda build: build["created"], reverse=True):
+        if version not in (build["version"], build["version"].split('+')[0]):
+            continue
+        if build_id and not build["build_id"].startswith(build_id):
+            continue
+        for name, file_entry in build["files"].items():
+            if abi in (name, name.replace("android-", "")) or file_entry["elf_build_id"].startswith(abi):
+                return build, file_entry
+    return None, None
+
+def list_symbols():
+    """Prints every archived build"""
+    builds = load_json(SYMBOLS_INDEX_FILE, {"builds": []})["builds"]
+    if not builds:
+        print(f"{YELLOW}No symbols archived yet in {SYMBOLS_ARCHIVE_DIR}{NC}")
+        return True
+    print(f"{BLUE}{'Version':<16} {'Build':<13} {'Archived':<17} {'Size':>9}  ABIs{NC}")
+    for build in sorted(builds, key=lambda build: build["created"]):
+        size = sum(entry.get("compressed_size", entry["size"]) for entry in build["files"].values())
+        created = time.strftime("%Y-%m-%d %H:%M", time.localtime(build["created"]))
+        print(f"{build['version']:<16} {build['build_id']:<13} {created:<17} {format_size(size):>9}  "
+              f"{', '.join(sorted(build['files']))}")
+    return True
+
+def extract_symbols(args):
+    """
+    Streams one symbols file out of the archive without decompressing the others.
+    Usage: symbols [<version> <abi|elf-build-id> [--build ID] [output file | -]]
+    """
+    build_id = None
+    positional = []
+    remaining = iter(args)
+    for arg in remaining:
+        if arg == "--build":
+            build_id = next(remaining, None)
+        elif arg.startswith("--build="):
+            build_id = arg.split("=", 1)[1]
         else:
-            run_flutter_command(["sleep", "0.1"], "Removing Podfile.lock                                 ")
-    except FileNotFoundError:
+            positional.append(arg)
+    if not positional:
+        return list_symbols()
+    if len(positional) < 2:
+        print(f"{RED}Usage: {sys.argv[0]} symbols <version> <abi> [--build ID] [output file | -]{NC}")
+        return False
+    version, abi = positional[:2]
+    build, file_entry = find_symbols(version, abi, build_id)
+    if not build:
+        print(f"{RED}No archived symbols for {version} / {abi}{NC}", file=sys.stderr)
+        return False
+    output = positional[2] if len(positional) > 2 else None
+    if output is None:
+        output = "-" if not sys.stdout.isatty() else os.path.join(SYMBOLS_OUTPUT_DIR, build["version"], file_entry["member"])
+    with zipfile.ZipFile(os.path.join(SYMBOLS_ARCHIVE_DIR, build["archive"])) as archive, \
+            archive.open(file_entry["member"]) as source:
+        if output == "-":
+            shutil.copyfileobj(source, sys.stdout.buffer, 1024 * 1024)
+            sys.stdout.buffer.flush()
+            return True
+        directory = os.path.dirname(output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output, 'wb') as destination:
+            shutil.copyfileobj(source, destination, 1024 * 1024)
+    print(f"{GREEN}✓ {file_entry['member']} of {build['version']} (build {build['build_id']}) written to {output}{NC}")
+    return True
+
+# ============================================================================
+# WATCH MODE FUNCTIONS
+# ============================================================================
+
+# Quiet period that ends a burst of file events (editors save several files at once)
+WATCH_DEBOUNCE_SECONDS = 0.3
+# Scan interval of the polling watcher used where inotify is not available
+WATCH_POLL_INTERVAL = 0.5
+BUILD_RUNNER_WATCH_COMMAND = ["dart", "run", "build_runner", "watch", "--delete-conflicting-outputs"]
+# build_runner lines that end a build, and lines worth showing while watching
+BUILD_RUNNER_DONE_PATTERN = re.compile(r"\b(Succeeded|Failed) after\b")
+BUILD_RUNNER_NOTICE_PATTERN = re.compile(r"\[(SEVERE|WARNING)\]|\b(Succeeded|Failed) after\b")
+# inotify event masks (see inotify(7))
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+INOTIFY_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+class PollingWatcher:
+    """Detects changed files by comparing mtime/size snapshots of the watched trees"""
+    name = "polling"
+
+    def __init__(self, directories, files):
+        self.directories = [directory for directory in directories if os.path.isdir(directory)]
+        self.files = list(files)
+        self.snapshot = self.scan()
+
+    def scan(self):
+        entries = {}
+        paths = [path for path in self.files if os.path.isfile(path)]
+        for directory in self.directories:
+            for root, _, names in os.walk(directory):
+                paths += [os.path.join(root, name) for name in names]
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries[os.path.normpath(path).replace(os.sep, '/')] = (stat.st_mtime_ns, stat.st_size)
+        return entries
+
+    def changes(self, timeout):
+        """Returns the set of paths changed since the last call, waiting up to timeout seconds"""
+        deadline = time.time() + timeout
+        while True:
+            time.sleep(max(0, min(WATCH_POLL_INTERVAL, deadline - time.time())))
+            snapshot = self.scan()
+            changed = {path for path in set(snapshot) | set(self.snapshot)
+                       if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            if changed or time.time() >= deadline:
+                return changed
+
+    def close(self):
         pass
-    # Update pod repo
-    run_flutter_command(["pod", "repo", "update"], "Updating pod repository                               ")
-    # Install pods
-    run_flutter_command(["pod", "install"], "Installing pods                                       ")
-    # Return to root directory
-    os.chdir(current_dir)
-    print(f"\n{GREEN}✓ iOS pods updated successfully!{NC}")
+
+class InotifyWatcher:
+    """Receives file events from the Linux kernel through inotify, watching directories recursively"""
+    name = "inotify"
+
+    def __init__(self, directories, files):
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Watch descriptor -> (directory, whether every file in it is watched)
+        self.watches = {}
+        self.files = {os.path.normpath(path).replace(os.sep, '/') for path in files}
+        # Single files are watched through their directory, so atomic renames by editors are seen
+        for directory in {os.path.dirname(path) or "." for path in self.files}:
+            self.add_watch(directory, False)
+        for directory in directories:
+            self.add_tree(directory)
+
+    def add_watch(self, directory, recursive):
+        descriptor = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), INOTIFY_MASK)
+        if descriptor >= 0:
+            self.watches[descriptor] = (directory, recursive)
+
+    def add_tree(self, directory):
+        for root, _, _ in os.walk(directory):
+            self.add_watch(root, True)
+
+    def changes(self, timeout):
+        """Returns the set of paths changed since the last call, waiting up to timeout seconds"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        data = os.read(self.fd, 64 * 1024)
+        changed = set()
+        position = 0
+        while position + 16 <= len(data):
+            descriptor, mask, _, length = struct.unpack_from("iIII", data, position)
+            name = data[position + 16:position + 16 + length].rstrip(b'\0').decode('utf-8', 'ignore')
+            position += 16 + length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped, so treat everything as changed
+                changed.update(self.files)
+                for directory, recursive in list(self.watches.values()):
+                    if recursive:
+                        changed.update(os.path.normpath(os.path.join(directory, name)).replace(os.sep, '/')
+                                       for name in os.listdir(directory) if os.path.isfile(os.path.join(directory, name)))
+                continue
+            if descriptor not in self.watches or not name:
+                continue
+            directory, recursive = self.watches[descriptor]
+            path = os.path.normpath(os.path.join(directory, name)).replace(os.sep, '/')
+            if mask & IN_ISDIR:
+                if recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                    self.add_tree(path)
+                continue
+            if recursive or path in self.files:
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+def create_watcher(directories, files):
+    """Returns an inotify watcher on Linux, or a polling watcher where inotify is unavailable"""
+    if platform.system() == "Linux":
+        try:
+            return InotifyWatcher(directories, files)
+        except (OSError, AttributeError) as e:
+            print(f"{YELLOW}inotify unavailable ({e}), falling back to polling{NC}")
+    return PollingWatcher(directories, files)
+
+class BuildRunnerWatch:
+    """
+    Keeps `build_runner watch` running in the background and reports how long after
+    a save each incremental build finished.
+    """
+
+    def __init__(self):
+        self.process = None
+        self.pending = []
+        self.lock = threading.Lock()
+
+    def start(self):
+        os.makedirs(LOG_DIR, exist_ok=True)
+        self.process = subprocess.Popen(
+            BUILD_RUNNER_WATCH_COMMAND,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            shell=platform.system() == "Windows",
+            start_new_session=platform.system() != "Windows",
+            creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if platform.system() == "Windows" else 0,
+            text=True,
+            encoding='utf-8',
+            errors='ignore',
+        )
+        _RUNNING_PROCESSES[self.process] = False
+        threading.Thread(target=self.read_output, args=(self.process,), daemon=True).start()
+        console_print(f"{BLUE}Started `{' '.join(BUILD_RUNNER_WATCH_COMMAND)}`{NC}")
+
+    def read_output(self, process):
+        with open(os.path.join(LOG_DIR, "build_runner_watch.log"), 'a', encoding='utf-8') as log_file:
+            for line in process.stdout:
+                log_file.write(line)
+                log_file.flush()
+                line = line.rstrip()
+                if not BUILD_RUNNER_NOTICE_PATTERN.search(line):
+                    continue
+                with self.lock:
+                    pending, self.pending = (self.pending, []) if BUILD_RUNNER_DONE_PATTERN.search(line) else ([], self.pending)
+                if pending:
+                    saved_at, paths = min(pending)[0], sorted({path for _, changed in pending for path in changed})
+                    color = GREEN if "Succeeded" in line else RED
+                    console_print(f"{color}  build_runner: {format_changed_paths(paths)} → "
+                                  f"{time.time() - saved_at:.2f}s after save ({line.split('] ')[-1]}){NC}")
+                else:
+                    console_print(f"  build_runner: {line.split('] ')[-1]}")
+
+    def expect(self, saved_at, paths):
+        """Registers changed sources whose regenerated output the next build should report"""
+        with self.lock:
+            self.pending.append((saved_at, paths))
+
+    def restart_if_exited(self):
+        """build_runner watch exits on its own when the package graph changes"""
+        if self.process and self.process.poll() is not None:
+            _RUNNING_PROCESSES.pop(self.process, None)
+            console_print(f"{YELLOW}build_runner watch exited with code {self.process.returncode}, restarting{NC}")
+            self.start()
+
+    def stop(self):
+        if self.process:
+            terminate_processes([self.process])
+            _RUNNING_PROCESSES.pop(self.process, None)
+
+def format_changed_paths(paths):
+    """Short description of a set of changed paths for the watch log"""
+    names = [os.path.basename(path) for path in sorted(paths)]
+    return ", ".join(names[:3]) + (f" (+{len(names) - 3} more)" if len(names) > 3 else "")
+
+def saved_at(paths):
+    """Time of the earliest save among the changed paths, from their modification times"""
+    times = [os.path.getmtime(path) for path in paths if os.path.isfile(path)]
+    return min(times) if times else time.time()
+
+def classify_watch_changes(paths, arb_dir, uses_build_runner, uses_asset_codegen):
+    """
+    Maps changed paths to the smallest set of actions: "pub_get" for pubspec.yaml,
+    "gen_l10n" for .arb files and l10n.yaml, "build_runner" for codegen inputs (which
+    the running build_runner watch regenerates itself). Generated files are ignored.
+    """
+    l10n_outputs = set(collect_l10n_files()[1])
+    actions = {}
+    for path in sorted(paths):
+        if path == "pubspec.yaml":
+            action = "pub_get"
+        elif path == "l10n.yaml" or (path.endswith('.arb') and path.startswith(arb_dir.rstrip('/') + '/')):
+            action = "gen_l10n"
+        elif path.endswith(GENERATED_DART_SUFFIXES) or path in l10n_outputs:
+            continue
+        elif path.startswith("lib/") and path.endswith('.dart') and uses_build_runner:
+            # Deleted sources may have had generated parts, so build_runner has to see them too
+            if os.path.isfile(path):
+                with open(path, 'r', encoding='utf-8', errors='ignore') as file:
+                    if not CODEGEN_SOURCE_PATTERN.search(file.read()):
+                        continue
+            action = "build_runner"
+        elif path.startswith("assets/") and uses_asset_codegen:
+            action = "build_runner"
+        else:
+            continue
+        actions.setdefault(action, []).append(path)
+    return actions
+
+def watch_project():
+    """
+    Watches lib/, the .arb files, pubspec.yaml and assets/ and runs only the
+    regeneration each change needs until interrupted with Ctrl+C.
+    """
+    arb_dir = read_simple_yaml("l10n.yaml").get("arb-dir", "lib/l10n").rstrip('/')
+    packages = parse_pubspec_lock() if os.path.isfile("pubspec.lock") else {}
+    uses_build_runner = "build_runner" in packages
+    uses_asset_codegen = "flutter_gen_runner" in packages
+    directories = [directory for directory in ("lib", arb_dir, "assets") if os.path.isdir(directory)]
+    directories = [directory for directory in directories
+                   if not any(directory.startswith(other + '/') for other in directories if other != directory)]
+    watcher = create_watcher(directories, ["pubspec.yaml", "l10n.yaml"])
+    build_runner = BuildRunnerWatch() if uses_build_runner else None
+
+    print(f"{YELLOW}Watching {', '.join(directories + ['pubspec.yaml'])} ({watcher.name}). Press Ctrl+C to stop.{NC}\n")
+    if glob.glob(f"{arb_dir}/*.arb"):
+        run_codegen_command("gen_l10n", "Generating localizations                              ")
+    if build_runner:
+        build_runner.start()
+    try:
+        while True:
+            changed = watcher.changes(1.0)
+            if build_runner:
+                build_runner.restart_if_exited()
+            if not changed:
+                continue
+            # Wait for the burst to settle before acting on it
+            while True:
+                more = watcher.changes(WATCH_DEBOUNCE_SECONDS)
+                if not more:
+                    break
+                changed |= more
+            actions = classify_watch_changes(changed, arb_dir, uses_build_runner, uses_asset_codegen)
+            if "build_runner" in actions:
+                build_runner.expect(saved_at(actions["build_runner"]), actions["build_runner"])
+            if "pub_get" in actions:
+                started = saved_at(actions["pub_get"])
+                if run_pub_command(["flutter", "pub", "get"], "Getting dependencies                                  "):
+                    console_print(f"{GREEN}  pub get: pubspec.yaml → {time.time() - started:.2f}s after save{NC}")
+            if "gen_l10n" in actions:
+                started = saved_at(actions["gen_l10n"])
+                if run_codegen_command("gen_l10n", "Generating localizations                              "):
+                    console_print(f"{GREEN}  gen-l10n: {format_changed_paths(actions['gen_l10n'])} → "
+                                  f"{time.time() - started:.2f}s after save{NC}")
+    finally:
+        watcher.close()
+        if build_runner:
+            build_runner.stop()
+
+# ============================================================================
+# SIZE ANALYSIS FUNCTIONS
+# ============================================================================
+
+# Size history of every artifact, one JSON file per artifact name
+SIZE_HISTORY_DIR = os.path.join(TOOL_DIR, "sizes")
+# Number of snapshots kept per artifact
+SIZE_HISTORY_LIMIT = 50
+SIZE_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1048576, "GB": 1073741824}
+
+def load_project_config():
+    """Reads PROJECT_CONFIG_FILE from the project root, or {} when there is none"""
+    return load_json(PROJECT_CONFIG_FILE, {})
+
+def parse_size(value):
+    """Parses a size such as 1048576, "500KB" or "12.5 MB" into bytes"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.match(r'^\s*([0-9.]+)\s*([KMG]?B?)\s*$', str(value).upper())
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2) if match.group(2) in SIZE_UNITS else match.group(2) + "B"])
+
+def format_size(size_bytes, signed=False):
+    """Formats bytes as MB (KB below 100 KB, bytes below 1 KB)"""
+    sign = "+" if signed and size_bytes > 0 else ""
+    if abs(size_bytes) < 1024:
+        return f"{sign}{size_bytes} B"
+    if abs(size_bytes) < 100 * 1024:
+        return f"{sign}{size_bytes / 1024:.1f} KB"
+    return f"{sign}{size_bytes / 1048576:.2f} MB"
+
+def size_category(entry_name):
+    """Maps a path inside an APK or AAB to its size category"""
+    parts = entry_name.split('/')
+    if parts[0] == "base" and len(parts) > 1:
+        # App bundles keep the base module below base/
+        parts = parts[1:]
+    if parts[0] == "lib" and len(parts) >= 3:
+        abi, library = parts[1], parts[-1]
+        if library in ("libapp.so", "libflutter.so"):
+            return f"{library} ({abi})"
+        return f"native libs ({abi})"
+    if parts[-1].endswith(".dex") or parts[0] == "dex":
+        return "dex"
+    if parts[0] == "assets":
+        return "assets"
+    if parts[0] == "res" or parts[-1] in ("resources.arsc", "resources.pb"):
+        return "resources"
+    return "other"
+
+def analyze_artifact(path):
+    """
+    Groups the compressed and uncompressed sizes of an APK/AAB by category.
+    Only the zip central directory is read; nothing is extracted.
+    """
+    categories = {}
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            entry = categories.setdefault(size_category(info.filename), {"compressed": 0, "uncompressed": 0, "files": 0})
+            entry["compressed"] += info.compress_size
+            entry["uncompressed"] += info.file_size
+            entry["files"] += 1
+    stat = os.stat(path)
+    return {
+        "artifact": os.path.basename(path),
+        "version": get_version_from_pubspec(include_build_number=True) if os.path.isfile("pubspec.yaml") else None,
+        "recorded_at": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "file_size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "compressed": sum(entry["compressed"] for entry in categories.values()),
+        "uncompressed": sum(entry["uncompressed"] for entry in categories.values()),
+        "categories": categories,
+    }
+
+def record_size_snapshot(snapshot):
+    """
+    Stores a snapshot in the artifact's size history and returns the previous
+    build's snapshot (None for the first build). Re-analyzing an unchanged
+    artifact does not add a new entry.
+    """
+    history_path = os.path.join(SIZE_HISTORY_DIR, f"{snapshot['artifact']}.json")
+    with _STATE_LOCK:
+        history = load_json(history_path, [])
+        if history and (history[-1]["file_size"], history[-1]["mtime_ns"]) == (snapshot["file_size"], snapshot["mtime_ns"]):
+            return history[-2] if len(history) > 1 else None
+        previous = history[-1] if history else None
+        if previous and previous.get("version") == snapshot["version"]:
+            # A rebuild of the same version replaces its snapshot but is still compared with it
+            history.pop()
+        history.append(snapshot)
+        save_json(history_path, history[-SIZE_HISTORY_LIMIT:])
+    return previous
+
+def size_budgets_for(artifact_name, config):
+    """Returns the size budgets (in bytes) that apply to an artifact"""
+    budgets = {}
+    for key, value in config.get("size_budgets", {}).items():
+        if not isinstance(value, dict):
+            budgets[key] = parse_size(value)
+    for key, value in config.get("size_budgets", {}).get(artifact_name, {}).items():
+        budgets[key] = parse_size(value)
+    return budgets
+
+def check_size_budgets(snapshot, previous, budgets):
+    """Returns the budget violations of a snapshot as readable messages"""
+    violations = []
+    for key, limit in sorted(budgets.items()):
+        if key == "growth":
+            if previous is not None and snapshot["compressed"] - previous["compressed"] > limit:
+                violations.append(f"grew by {format_size(snapshot['compressed'] - previous['compressed'])} (budget {format_size(limit)})")
+        elif key == "total":
+            if snapshot["compressed"] > limit:
+                violations.append(f"total {format_size(snapshot['compressed'])} exceeds {format_size(limit)}")
+        elif key in snapshot["categories"] and snapshot["categories"][key]["compressed"] > limit:
+            violations.append(f"{key} {format_size(snapshot['categories'][key]['compressed'])} exceeds {format_size(limit)}")
+    return violations
+
+def print_size_report(snapshot, previous):
+    """Prints the category breakdown of an artifact and the change since the previous build"""
+    delta = f" ({format_size(snapshot['compressed'] - previous['compressed'], signed=True)} since {previous.get('version')})" if previous else ""
+    print(f"\n{BLUE}{snapshot['artifact']} ({snapshot['version']}) | Download: {format_size(snapshot['compressed'])}{delta} "
+          f"| Uncompressed: {format_size(snapshot['uncompressed'])}{NC}")
+    print(f"  {'Category':<28} {'Compressed':>11} {'Uncompressed':>13} {'Change':>11}")
+    previous_categories = previous["categories"] if previous else {}
+    names = sorted(set(snapshot["categories"]) | set(previous_categories),
+                   key=lambda name: -snapshot["categories"].get(name, {}).get("compressed", 0))
+    for name in names:
+        entry = snapshot["categories"].get(name, {"compressed": 0, "uncompressed": 0})
+        change = ""
+        if previous:
+            difference = entry["compressed"] - previous_categories.get(name, {}).get("compressed", 0)
+            change = format_size(difference, signed=True) if difference else "-"
+            if difference > 0:
+                change = f"{YELLOW}{change:>11}{NC}"
+        print(f"  {name:<28} {format_size(entry['compressed']):>11} {format_size(entry['uncompressed']):>13} {change:>11}")
+
+def report_artifact_sizes(paths=None):
+    """
+    Analyzes APK/AAB artifacts, records their size snapshots, prints the
+    breakdown and diff, and checks the size budgets from PROJECT_CONFIG_FILE.
+    Returns False if any budget is exceeded. Artifacts that are not readable
+    archives are reported and skipped; they have no size budget to exceed.
+    """
+    if paths is None:
+        paths = sorted(glob.glob("build/app/outputs/flutter-apk/*.apk") + glob.glob("build/app/outputs/bundle/release/*.aab"))
+    if not paths:
+        print(f"{RED}No APK or AAB found in build/app/outputs/.{NC}")
+        return False
+    config = load_project_config()
+    within_budget = True
+    for path in paths:
+        try:
+            snapshot = analyze_artifact(path)
+        except zipfile.BadZipFile:
+            print(f"{YELLOW}Warning: {path} is not a valid APK/AAB archive, skipping its size report.{NC}")
+            continue
+        previous = record_size_snapshot(snapshot)
+        print_size_report(snapshot, previous)
+        try:
+            violations = check_size_budgets(snapshot, previous, size_budgets_for(snapshot["artifact"], config))
+        except ValueError as e:
+            print(f"{RED}Error in {PROJECT_CONFIG_FILE} size_budgets: {e}{NC}")
+            return False
+        for violation in violations:
+            print(f"  {CROSS} {RED}Size budget exceeded: {violation}{NC}")
+        within_budget = within_budget and not violations
+    return within_budget
+
+def analyze_sizes(paths):
+    """Size breakdown command: analyze the given artifacts or every built APK/AAB"""
+    print(f"{YELLOW}Analyzing artifact sizes...{NC}")
+    within_budget = report_artifact_sizes(paths or None)
+    if within_budget:
+        print(f"\n{GREEN}✓ All artifacts are within their size budgets.{NC}")
+    return within_budget
 
 # ============================================================================
 # GIT TAG FUNCTIONS
 # ============================================================================
 
-def get_version_from_pubspec():
+def get_version_from_pubspec(include_build_number=False):
     """Get the version from pubspec.yaml using regex"""
     if os.path.isfile("pubspec.yaml"):
         with open("pubspec.yaml", 'r', encoding='utf-8') as file:
@@ -356,8 +3084,8 @@ def get_version_from_pubspec():
                 if version_match:
                     version = version_match.group(1).strip()
                     # Remove quotes if present and split by + to get only version number
-                    version = version.strip('"\'').split('+')[0]
-                    return version
+                    version = version.strip('"\'')
+                    return version if include_build_number else version.split('+')[0]
                 else:
                     print(f"{RED}Error: Could not find 'version' field in pubspec.yaml.{NC}")
                     return None
@@ -369,14 +3097,15 @@ def get_version_from_pubspec():
         print(f"Please run this command from the root of a Flutter project.")
         return None
 
-def create_and_push_tag():
-    """Create git tag from pubspec version and push to remote"""
-    print(f"{YELLOW}Creating and pushing git tag...{NC}\n")
-    
+def prepare_tag():
+    """
+    Checks the tag for the pubspec version before it is created, asking whether
+    an existing local tag should be recreated. Returns the tag name, or None.
+    """
     # Get version from pubspec.yaml
     version = get_version_from_pubspec()
     if not version:
-        return False
+        return None
     
     tag_name = f"v{version}"
     
@@ -392,24 +3121,25 @@ def create_and_push_tag():
             user_input = input(f"Do you want to delete and recreate it? (y/N): ")
             if user_input.lower() != 'y':
                 print(f"{YELLOW}Operation cancelled.{NC}")
-                return False
+                return None
             # Delete existing tag
             subprocess.run(["git", "tag", "-d", tag_name])
             print(f"{GREEN}Deleted existing local tag: {tag_name}{NC}")
     except Exception as e:
         print(f"{RED}Error checking existing tags: {e}{NC}")
+        return None
+    return tag_name
+
+def create_and_push_tag():
+    """Create git tag from pubspec version and push to remote"""
+    print(f"{YELLOW}Creating and pushing git tag...{NC}\n")
+    tag_name = prepare_tag()
+    if not tag_name:
         return False
     
-    # Create git tag
-    success = run_flutter_command(["git", "tag", tag_name], f"Creating tag {tag_name}...                             ")
-    if not success:
-        print(f"{RED}Failed to create git tag.{NC}")
-        return False
-    
-    # Push tag to remote
-    success = run_flutter_command(["git", "push", "-u", "origin", tag_name], f"Pushing tag to remote...                            ")
-    if not success:
-        print(f"{RED}Failed to push tag to remote.{NC}")
+    # Create the tag, then push it to the remote
+    if not run_pipeline(pipeline_steps("tag")):
+        print(f"{RED}Failed to create and push git tag {tag_name}.{NC}")
         return False
     
     print(f"\n{GREEN}✓ Git tag {tag_name} created and pushed successfully!{NC}")
@@ -417,31 +3147,501 @@ def create_and_push_tag():
 
 def uninstall_app():
     """Uninstall the app from connected device"""
-    print(f"{YELLOW}Uninstalling app from device...{NC}\n")
-    success = run_flutter_command(["adb", "uninstall", "com.royalcourtbd.dhaka_bus"], "Uninstalling app...                                 ")
+    package_name = get_package_name()
+    if not package_name:
+        print(f"{RED}Could not determine the application id (set \"package_name\" in {PROJECT_CONFIG_FILE}){NC}")
+        return False
+    print(f"{YELLOW}Uninstalling {package_name} from device...{NC}\n")
+    success = run_flutter_command([ADB_COMMAND, "uninstall", package_name], "Uninstalling app...                                 ")
     if success:
         print(f"\n{GREEN}✓ App uninstalled successfully!{NC}")
     else:
         print(f"\n{RED}✗ Failed to uninstall app!{NC}")
     return success
 
-def create_page(page_name):
-    """Create page structure"""
-    print(f"{YELLOW}Creating page...{NC}\n")
-    if not page_name:
+def load_page_generator():
+    """Imports create_page.py from the directory of this script"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    if not os.path.isfile(os.path.join(script_dir, "create_page.py")):
+        return None
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    import create_page as page_generator
+    return page_generator
+
+def create_page(page_args):
+    """
+    Create page structure for one or more features.
+    Parameters:
+        page_args: Page names and/or `--from <features.yaml>`, or `--list` / `--verify`
+    """
+    if not page_args:
         print(f"{RED}Error: Page name is required.{NC}")
-        print(f"Usage: {sys.argv[0]} page <page_name>")
+        print(f"Usage: {sys.argv[0]} page <page_name> [<page_name> ...] | page --from <features.yaml> | page --list | page --verify")
         sys.exit(1)
-    # Run the create_page with the page name
-    try:
-        subprocess.run(["python3", "create_page.py", "page", page_name], check=True)
-    except subprocess.CalledProcessError:
-        print(f"{RED}Error: Failed to run page generator.{NC}")
-        sys.exit(1)
-    except FileNotFoundError:
+    if "--list" not in page_args and "--verify" not in page_args:
+        print(f"{YELLOW}Creating page...{NC}\n")
+    # Run the page generator in-process instead of spawning an interpreter per page
+    page_generator = load_page_generator()
+    if page_generator is None:
         print(f"{RED}Error: create_page.py not found.{NC}")
-        print("Make sure create_page.py exists in the current directory.")
+        print("Make sure create_page.py exists next to flutter_build.py.")
         sys.exit(1)
+    # The generator prints its own errors and exits non-zero on failure
+    page_generator.run_page_command(page_args)
+
+# ============================================================================
+# BENCHMARK FUNCTIONS
+# ============================================================================
+
+# Pipelines measured by `bench` when none are named
+BENCH_PIPELINES = ["apk", "aab", "setup", "release-run", "page"]
+
+# Fake SDK tool installed on PATH by `bench`. It prints a configurable amount of
+# output, sleeps for a configurable time, mimics the files the real tool leaves
+# behind and appends its busy interval to FLUTTER_BUILD_STUB_LOG.
+BENCH_STUB_SCRIPT = """#!{python} -S
+import json, os, shutil, sys, time, zipfile
+start = time.time()
+tool = os.path.basename(sys.argv[0])
+args = sys.argv[1:]
+command = " ".join(args)
+lines = int(os.environ.get("FLUTTER_BUILD_STUB_LINES", "200"))
+width = max(1, int(os.environ.get("FLUTTER_BUILD_STUB_LINE_BYTES", "80")))
+sleep = float(os.environ.get("FLUTTER_BUILD_STUB_SLEEP", "0.05"))
+
+def write_archive(path, abis, prefix=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as archive:
+        for abi in abis:
+            archive.writestr(f"{{prefix}}lib/{{abi}}/libapp.so", os.urandom(48 * 1024))
+        archive.writestr(f"{{prefix}}{{'dex/' if prefix else ''}}classes.dex", os.urandom(16 * 1024))
+
+if tool == "flutter" and command.startswith("clean"):
+    shutil.rmtree(".dart_tool", ignore_errors=True)
+    shutil.rmtree("build", ignore_errors=True)
+elif tool == "flutter" and command.startswith(("pub get", "pub upgrade")):
+    os.makedirs(".dart_tool", exist_ok=True)
+    with open(".dart_tool/package_config.json", "w") as file:
+        file.write('{{"configVersion": 2, "packages": []}}')
+elif tool == "flutter" and command.startswith("build apk"):
+    if "--split-per-abi" in args:
+        for abi in ("armeabi-v7a", "arm64-v8a", "x86_64"):
+            write_archive(f"build/app/outputs/flutter-apk/app-{{abi}}-release.apk", [abi])
+    else:
+        write_archive("build/app/outputs/flutter-apk/app-release.apk", ["arm64-v8a"])
+elif tool == "flutter" and command.startswith("build appbundle"):
+    write_archive("build/app/outputs/bundle/release/app-release.aab", ["arm64-v8a"], prefix="base/")
+elif tool == "adb" and command.startswith("devices"):
+    print("List of devices attached")
+    print("stub-device-1\\tdevice")
+
+line = ("x" * width)[:width - 1] + "\\n"
+output = sys.stdout
+for _ in range(lines):
+    output.write(line)
+output.flush()
+time.sleep(sleep)
+with open(os.environ["FLUTTER_BUILD_STUB_LOG"], "a") as log:
+    log.write(json.dumps({{"tool": tool, "args": args, "start": start, "end": time.time(), "bytes": lines * width}}) + "\\n")
+"""
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)]
+
+def busy_time(intervals):
+    """Total time covered by at least one of the (start, end) intervals"""
+    total = 0.0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+def create_bench_project(bench_dir):
+    """Creates a throw-away project with the tool scripts and stub SDK binaries"""
+    project_dir = os.path.join(bench_dir, "project")
+    stub_dir = os.path.join(bench_dir, "bin")
+    os.makedirs(os.path.join(project_dir, "lib", "core", "di"), exist_ok=True)
+    os.makedirs(stub_dir, exist_ok=True)
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    for script in ("flutter_build.py", "create_page.py"):
+        shutil.copy(os.path.join(script_dir, script), project_dir)
+    for path in ("pubspec.yaml", "pubspec.lock", "lib/core/di/service_locator.dart"):
+        if os.path.isfile(path):
+            shutil.copy(path, os.path.join(project_dir, path))
+    if not os.path.isfile(os.path.join(project_dir, "pubspec.yaml")):
+        with open(os.path.join(project_dir, "pubspec.yaml"), 'w', encoding='utf-8') as file:
+            file.write("name: bench_project\nversion: 1.0.0+1\n")
+    stub = BENCH_STUB_SCRIPT.format(python=sys.executable)
+    for tool in ("flutter", "dart", "adb", "pod", "xdg-open", "open"):
+        stub_path = os.path.join(stub_dir, tool)
+        with open(stub_path, 'w', encoding='utf-8') as file:
+            file.write(stub)
+        os.chmod(stub_path, 0o755)
+    return project_dir, stub_dir
+
+def run_bench_once(project_dir, env, argv):
+    """Runs one pipeline in the bench project. Returns (exit code, wall seconds, peak RSS in bytes)"""
+    started = time.time()
+    process = subprocess.Popen(argv, cwd=project_dir, env=env, stdin=subprocess.DEVNULL,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+        peak_rss = usage.ru_maxrss if platform.system() == "Darwin" else usage.ru_maxrss * 1024
+    else:
+        process.wait()
+        peak_rss = None
+    return process.returncode, time.time() - started, peak_rss
+
+@timer_decorator
+def run_benchmark(args):
+    """
+    Measures the tool's own overhead by running pipelines against stub SDK binaries.
+    Usage: bench [pipeline ...] [--runs N] [--lines N] [--line-bytes N] [--sleep SECONDS]
+    """
+    settings = {"--runs": "5", "--lines": "200", "--line-bytes": "80", "--sleep": "0.05"}
+    pipelines = []
+    remaining = iter(args)
+    for arg in remaining:
+        if arg in settings:
+            settings[arg] = next(remaining, settings[arg])
+        else:
+            pipelines.append(arg)
+    pipelines = pipelines or BENCH_PIPELINES
+    unknown = [name for name in pipelines if name not in BENCH_PIPELINES]
+    if unknown:
+        print(f"{RED}Error: Unknown bench pipeline(s): {', '.join(unknown)}. Choose from: {', '.join(BENCH_PIPELINES)}{NC}")
+        sys.exit(1)
+    if platform.system() == "Windows":
+        print(f"{RED}Error: bench needs a POSIX shell to run its stub binaries.{NC}")
+        sys.exit(1)
+    runs = int(settings["--runs"])
+
+    bench_dir = tempfile.mkdtemp(prefix="flutter_build_bench_")
+    try:
+        project_dir, stub_dir = create_bench_project(bench_dir)
+        stub_log = os.path.join(bench_dir, "stub_calls.jsonl")
+        env = dict(os.environ)
+        env.update({
+            "PATH": stub_dir + os.pathsep + env.get("PATH", ""),
+            "FLUTTER_BUILD_STUB_LOG": stub_log,
+            "FLUTTER_BUILD_STUB_LINES": settings["--lines"],
+            "FLUTTER_BUILD_STUB_LINE_BYTES": settings["--line-bytes"],
+            "FLUTTER_BUILD_STUB_SLEEP": settings["--sleep"],
+        })
+        print(f"{YELLOW}Benchmarking {', '.join(pipelines)} ({runs} run(s) each, {settings['--lines']} line(s) "
+              f"of {settings['--line-bytes']} bytes and {settings['--sleep']}s per stub call, --jobs {OPTIONS['jobs']})...{NC}\n")
+        print(f"{BLUE}{'Pipeline':<12} {'Wall p50':>9} {'Overhead p50':>13} {'p90':>8} {'max':>8} {'Peak RSS':>9} {'Output/run':>11}{NC}")
+        for pipeline in pipelines:
+            overheads, walls, peaks, output_bytes = [], [], [], []
+            failures = 0
+            for run in range(runs):
+                open(stub_log, 'w').close()
+                argv = [sys.executable, "flutter_build.py", "--force", "--jobs", str(OPTIONS["jobs"]), pipeline]
+                if pipeline == "page":
+                    argv.append(f"bench_feature_{run}")
+                exit_code, wall, peak_rss = run_bench_once(project_dir, env, argv)
+                with open(stub_log, 'r', encoding='utf-8') as file:
+                    calls = [json.loads(line) for line in file if line.strip()]
+                failures += exit_code != 0
+                walls.append(wall)
+                overheads.append(wall - busy_time([(call["start"], call["end"]) for call in calls]))
+                output_bytes.append(sum(call["bytes"] for call in calls))
+                if peak_rss is not None:
+                    peaks.append(peak_rss)
+            peak = f"{max(peaks) / 1048576:.1f} MB" if peaks else "n/a"
+            print(f"{pipeline:<12} {percentile(walls, 50):>8.3f}s {percentile(overheads, 50) * 1000:>11.1f}ms "
+                  f"{percentile(overheads, 90) * 1000:>6.1f}ms {max(overheads) * 1000:>6.1f}ms {peak:>9} "
+                  f"{percentile(output_bytes, 50) / 1024:>8.1f} KB")
+            if failures:
+                print(f"{RED}  {failures} of {runs} run(s) exited with a non-zero code{NC}")
+        print(f"\n{BLUE}Overhead is wall time not covered by any stub process: spawning, output handling,")
+        print(f"spinner and bookkeeping of flutter_build.py itself.{NC}")
+    finally:
+        shutil.rmtree(bench_dir, ignore_errors=True)
+
+# ============================================================================
+# PIPELINE DEFINITIONS
+# ============================================================================
+
+# Built-in pipelines as data: command -> steps. A step has an "id", a "description",
+# either an "argv" or the name of a built-in "action" (STEP_ACTIONS), and the ids of
+# the steps it runs "after". `flutter pub` argv goes through the pub fingerprint
+# ("cacheable": false always resolves), argv of a code generator through the codegen
+# manifest, and "{version}" is replaced with the pubspec version. Projects replace
+# or add pipelines under "pipelines" in PROJECT_CONFIG_FILE.
+CLEAN_STEP = {"id": "clean", "description": "Cleaning project...", "argv": ["flutter", "clean"]}
+PUB_GET_STEP = {"id": "pub_get", "description": "Getting dependencies...", "argv": ["flutter", "pub", "get"],
+                "after": ["clean"]}
+BUILD_RUNNER_STEP = {"id": "build_runner", "description": "Generating build files...",
+                     "argv": CODEGEN_GENERATORS["build_runner"][0], "after": ["pub_get"]}
+GEN_L10N_STEP = {"id": "gen_l10n", "description": "Generating localizations...",
+                 "argv": CODEGEN_GENERATORS["gen_l10n"][0], "after": ["pub_get"]}
+PIPELINES = {
+    "apk": [
+        CLEAN_STEP, PUB_GET_STEP, BUILD_RUNNER_STEP,
+        {"id": "build_apk", "description": "Building APK...", "argv": BUILD_APK_COMMAND, "after": ["build_runner"]},
+    ],
+    "apk-split": [
+        CLEAN_STEP, PUB_GET_STEP, BUILD_RUNNER_STEP,
+        {"id": "build_apk_split", "description": "Building APK (split-per-abi)...", "argv": BUILD_APK_SPLIT_COMMAND,
+         "after": ["build_runner"]},
+    ],
+    "aab": [
+        CLEAN_STEP, PUB_GET_STEP, BUILD_RUNNER_STEP,
+        {"id": "build_aab", "description": "Building AAB...", "argv": BUILD_AAB_COMMAND, "after": ["build_runner"]},
+    ],
+    "release-run": [
+        CLEAN_STEP, PUB_GET_STEP, GEN_L10N_STEP, BUILD_RUNNER_STEP,
+        {"id": "build_apk", "description": "Building APK...", "argv": BUILD_APK_COMMAND,
+         "after": ["gen_l10n", "build_runner"]},
+    ],
+    "web": [
+        CLEAN_STEP, PUB_GET_STEP, BUILD_RUNNER_STEP,
+        {"id": "build_web", "description": "Building web...", "argv": BUILD_WEB_COMMAND, "after": ["build_runner"]},
+        {"id": "compress_web", "description": "Precompressing web files...", "action": "compress_web",
+         "after": ["build_web"]},
+    ],
+    # Code generators only need resolved dependencies, so they run side by side.
+    # dart format rewrites sources, so analysis waits for it to finish.
+    "setup": [
+        CLEAN_STEP,
+        {"id": "pub_upgrade", "description": "Upgrading dependencies...", "argv": ["flutter", "pub", "upgrade"],
+         "cacheable": False, "after": ["clean"]},
+        dict(BUILD_RUNNER_STEP, after=["pub_upgrade"]),
+        dict(GEN_L10N_STEP, after=["pub_upgrade"]),
+        {"id": "pub_refresh", "description": "Refreshing dependencies...", "argv": ["flutter", "pub", "upgrade"],
+         "after": ["build_runner", "gen_l10n"]},
+        {"id": "format", "description": "Formatting code...", "action": "format", "after": ["pub_refresh"]},
+        {"id": "analyze", "description": "Analyzing code...", "action": "analyze", "after": ["format"]},
+    ],
+    # dart fix and dart format both rewrite sources, so this pipeline stays sequential
+    "cleanup": [
+        CLEAN_STEP, PUB_GET_STEP,
+        {"id": "fix", "description": "Fixing code issues...", "argv": ["dart", "fix", "--apply"], "after": ["pub_get"]},
+        {"id": "format", "description": "Following dart guidelines...", "action": "format", "after": ["fix"]},
+        {"id": "pub_upgrade_major", "description": "Upgrading major versions...",
+         "argv": ["flutter", "pub", "upgrade", "--major-versions"], "cacheable": False, "after": ["format"]},
+    ],
+    "lang": [dict(GEN_L10N_STEP, after=[])],
+    "db": [dict(BUILD_RUNNER_STEP, after=[])],
+    "tag": [
+        {"id": "git_tag", "description": "Creating tag v{version}...", "argv": ["git", "tag", "v{version}"]},
+        {"id": "git_push", "description": "Pushing tag to remote...", "argv": ["git", "push", "-u", "origin", "v{version}"],
+         "after": ["git_tag"]},
+    ],
+}
+# Steps implemented in Python, referenced by name from pipeline definitions
+STEP_ACTIONS = {
+    "analyze": analyze_step,
+    "format": format_step,
+    "optimize_assets": optimize_assets_step,
+    "compress_web": precompress_web_step,
+}
+# What a command does with its artifacts once its pipeline succeeded
+COMMAND_FINISHERS = {
+    "apk": finish_apk,
+    "apk-split": finish_apk_split,
+    "aab": finish_aab,
+    "release-run": finish_release_run,
+    "web": finish_web,
+}
+
+def pipeline_definitions():
+    """Built-in pipelines with the replacements and additions from PROJECT_CONFIG_FILE"""
+    pipelines = dict(PIPELINES)
+    pipelines.update(load_project_config().get("pipelines", {}))
+    return pipelines
+
+def expand_placeholders(text):
+    """Replaces {version} with the pubspec version. Raises ValueError if there is none."""
+    if "{version}" not in text:
+        return text
+    version = get_version_from_pubspec()
+    if not version:
+        raise ValueError("{version} is used but pubspec.yaml has no version")
+    return text.replace("{version}", version)
+
+def step_identity(spec):
+    """What a declared step runs; steps with the same id and identity are the same step"""
+    return spec.get("argv"), spec.get("action"), spec.get("cacheable", True)
+
+def step_action(spec):
+    """Returns the callable behind a declared step"""
+    if "action" in spec:
+        if spec["action"] not in STEP_ACTIONS:
+            raise ValueError(f"Step '{spec['id']}' uses unknown action '{spec['action']}' "
+                             f"(choose from: {', '.join(STEP_ACTIONS)})")
+        return STEP_ACTIONS[spec["action"]]
+    argv = [expand_placeholders(part) for part in spec["argv"]]
+    for generator, (cmd_list, _) in CODEGEN_GENERATORS.items():
+        if argv == cmd_list:
+            return lambda d: run_codegen_command(generator, d)
+    if argv[:2] == ["flutter", "pub"]:
+        return lambda d: run_pub_command(argv, d, cacheable=spec.get("cacheable", True))
+    return lambda d: run_flutter_command(argv, d)
+
+def plan_steps(specs):
+    """
+    Turns declared steps into pipeline steps and adds the asset and warm-up stages
+    in front of the `flutter build` steps. Raises ValueError for invalid declarations.
+    """
+    steps = []
+    for spec in specs:
+        if "id" not in spec or ("argv" in spec) == ("action" in spec):
+            raise ValueError(f"Pipeline step {spec.get('id', '?')!r} needs an id and either argv or action")
+        step = pipeline_step(spec["id"], f"{expand_placeholders(spec.get('description', spec['id'])):<53}",
+                             step_action(spec), after=spec.get("after", ()))
+        step["base_id"] = spec.get("base_id", spec["id"])
+        step["command"] = " ".join(expand_placeholders(part) for part in spec["argv"]) if "argv" in spec \
+            else f"<{spec['action']}>"
+        steps.append(step)
+    build_ids = [spec["id"] for spec in specs if spec.get("argv", [])[:2] == ["flutter", "build"]]
+    android_ids = [spec["id"] for spec in specs if spec["id"] in build_ids and spec["argv"][2:3] in (["apk"], ["appbundle"])]
+    if build_ids:
+        steps = with_asset_stage(steps, *build_ids)
+    if android_ids:
+        steps = with_warmup_stage(steps, *android_ids)
+    return steps
+
+def pipeline_steps(command):
+    """Pipeline steps of one command"""
+    return plan_steps(pipeline_definitions()[command])
+
+def merge_pipelines(commands):
+    """
+    Merges the pipelines of several commands into one list of step declarations.
+    A step declared the same way by an earlier pipeline runs once, unless it
+    depends on a step added by the later pipeline: then it has to run again and
+    is renamed to "<command>.<id>". Steps that a pipeline adds run after the last
+    steps of the pipeline before it, so the commands still happen in order.
+    Raises ValueError for invalid pipelines.
+    """
+    pipelines = pipeline_definitions()
+    plan = {}
+    previous_sinks = []
+    for command in commands:
+        specs = order_steps([dict(spec, after=list(spec.get("after", ()))) for spec in pipelines[command]])
+        ids = {}
+        added = set()
+        for spec in specs:
+            after = [ids[dependency] for dependency in spec["after"]]
+            existing = plan.get(spec["id"])
+            if existing is not None and step_identity(existing) == step_identity(spec) and not added.intersection(after):
+                ids[spec["id"]] = spec["id"]
+                continue
+            step_id = spec["id"] if existing is None else f"{command}.{spec['id']}"
+            # Steps after another added step already wait for the previous pipeline through it
+            if not added.intersection(after):
+                after += [sink for sink in previous_sinks if sink not in after]
+            plan[step_id] = dict(spec, id=step_id, base_id=spec.get("base_id", spec["id"]), after=after)
+            ids[spec["id"]] = step_id
+            added.add(step_id)
+        dependencies = {dependency for spec in specs for dependency in spec["after"]}
+        previous_sinks = [ids[spec["id"]] for spec in specs if spec["id"] not in dependencies]
+    return list(plan.values())
+
+def print_plan(commands, steps):
+    """Prints the steps of a plan in execution order without running them"""
+    ordered = order_steps(steps)
+    print(f"{YELLOW}Plan for {' '.join(commands)}: {len(ordered)} step(s), up to {OPTIONS['jobs']} at once{NC}\n")
+    for number, step in enumerate(ordered, 1):
+        after = f"  {BLUE}after {', '.join(step['after'])}{NC}" if step["after"] else ""
+        print(f"{number:>3}. {step['id']:<20} {step.get('command', '<build stage>')}{after}")
+    return True
+
+@timer_decorator
+def run_commands(commands):
+    """Runs the pipelines of several commands as one plan in which shared steps run once"""
+    print(f"{YELLOW}Running {' + '.join(commands)}...{NC}\n")
+    if "tag" in commands and not prepare_tag():
+        return False
+    if not run_pipeline(plan_steps(merge_pipelines(commands))):
+        print(f"\n{RED}✗ {' '.join(commands)} failed!{NC}")
+        return False
+    # Commands that report on or ship their artifacts do so once the whole plan succeeded
+    results = [COMMAND_FINISHERS[command]() for command in commands if command in COMMAND_FINISHERS]
+    if all(results):
+        print(f"\n{GREEN}✓ {' '.join(commands)} completed successfully!{NC}")
+    return all(results)
+
+def plan_command(commands):
+    """Validates a multi-command invocation, then prints (--dry-run) or runs its plan"""
+    commands = list(dict.fromkeys(commands))
+    pipelines = pipeline_definitions()
+    unknown = [command for command in commands if command not in pipelines]
+    if unknown:
+        print(f"{RED}Error: {', '.join(unknown)} cannot be combined or planned. "
+              f"Pipeline commands: {', '.join(pipelines)}{NC}")
+        return False
+    try:
+        steps = plan_steps(merge_pipelines(commands))
+        if OPTIONS["dry_run"]:
+            return print_plan(commands, steps)
+        order_steps(steps)
+    except ValueError as e:
+        print(f"{RED}Error: {e}{NC}")
+        return False
+    return run_commands(commands)
+
+def parse_options(argv):
+    """
+    Removes global --options from the argument list and stores them in OPTIONS.
+    Returns the remaining positional arguments.
+    """
+    args = []
+    remaining = iter(argv)
+    for arg in remaining:
+        if arg == "--tail":
+            OPTIONS["tail"] = True
+        elif arg == "--force":
+            OPTIONS["force"] = True
+        elif arg == "--no-cache":
+            OPTIONS["no_cache"] = True
+        elif arg == "--optimize-assets":
+            OPTIONS["optimize_assets"] = True
+        elif arg == "--monitor":
+            OPTIONS["monitor"] = DEFAULT_RESOURCE_REPORT
+        elif arg.startswith("--monitor="):
+            OPTIONS["monitor"] = arg.split("=", 1)[1] or DEFAULT_RESOURCE_REPORT
+        elif arg == "--keep-going":
+            OPTIONS["keep_going"] = True
+        elif arg == "--dry-run":
+            OPTIONS["dry_run"] = True
+        elif arg == "--changed":
+            OPTIONS["changed"] = True
+        elif arg == "--base" or arg.startswith("--base="):
+            value = arg.split("=", 1)[1] if "=" in arg else next(remaining, "")
+            if not value:
+                print(f"{RED}Error: --base expects a git ref.{NC}")
+                sys.exit(1)
+            OPTIONS["base"] = value
+        elif arg in ("--jobs", "-j") or arg.startswith("--jobs="):
+            value = arg.split("=", 1)[1] if "=" in arg else next(remaining, "")
+            if not value.isdigit() or int(value) < 1:
+                print(f"{RED}Error: --jobs expects a positive number.{NC}")
+                sys.exit(1)
+            OPTIONS["jobs"] = int(value)
+        elif arg == "--trace" or arg.startswith("--trace="):
+            value = arg.split("=", 1)[1] if "=" in arg else next(remaining, "")
+            if not value:
+                print(f"{RED}Error: --trace expects an output file path.{NC}")
+                sys.exit(1)
+            OPTIONS["trace"] = value
+        else:
+            args.append(arg)
+    return args
 
 def show_usage():
     """Show usage information"""
@@ -450,63 +3650,136 @@ def show_usage():
     print("  apk          Build release APK (Full Process)")
     print("  apk-split    Build APK with --split-per-abi")
     print("  aab          Build release AAB")
+    print("  web          Build release web app, gzip-precompress it and write a content-hashed asset manifest")
+    print("  matrix       Prepare once, then build apk, apk-split and/or aab concurrently")
+    print(f"  size         Size breakdown of built APK/AAB files vs. the previous build (budgets in {PROJECT_CONFIG_FILE})")
     print("  lang         Generate localization files")
     print("  db           Run build_runner")
+    print("  watch        Watch lib/, .arb files, pubspec.yaml and assets/ and regenerate only what changed")
     print("  setup        Perform full project setup")
     print("  cache-repair Repair pub cache")
+    print("  cache-verify Verify pubspec.lock packages in the pub cache and re-fetch only broken ones")
     print("  cleanup      Clean project and get dependencies")
-    print("  release-run  Build & install release APK on connected device")
+    print("  check        Format and analyze only changed Dart files and their direct importers")
+    print("  release-run  Build & install release APK on all connected devices")
+    print("  install      Install the built APK on all (or the given) devices, skipping up-to-date ones")
     print("  uninstall    Uninstall app from connected device")
-    print("  pod          Update iOS pods")
+    print("  pod          Update iOS pods when Podfile, plugins or Podfile.lock changed (--reset: delete the lock, full repo update)")
     print("  tag          Create and push git tag from pubspec version")
-    print("  page         Create page structure (usage: {sys.argv[0]} page <page_name>)")
+    print(f"  page         Create page structure (usage: {sys.argv[0]} page <page_name> [...] | --from <features.yaml> | --list | --verify)")
+    print("  assets       Losslessly recompress PNGs and minify SVGs in assets/, web/icons and mipmap-*")
+    print("  symbols      List archived debug symbols, or extract one: symbols <version> <abi> [--build ID] [file | -]")
+    print("  bench        Measure the tool's own overhead with stub flutter/dart/adb binaries")
+    print("\nOptions:")
+    print("  --tail       Stream command output live above the spinner")
+    print("  --force      Re-run steps even when their inputs are unchanged")
+    print("  --keep-going After a failed step, still run the steps that do not depend on it")
+    print("  --dry-run    Print the steps a pipeline command (or several) would run, without running them")
+    print("  --no-cache   Neither restore nor store release builds in the artifact cache")
+    print("  --changed    Format/analyze only Dart files changed against the base ref (setup, cleanup)")
+    print("  --base REF   Base ref for --changed and check (default: origin/main, main or master)")
+    print(f"  --monitor[=FILE]  Sample CPU, memory and disk I/O of every step's process tree (JSON: {DEFAULT_RESOURCE_REPORT})")
+    print(f"  --optimize-assets  Optimize asset images before building (or \"optimize_assets\": true in {PROJECT_CONFIG_FILE})")
+    print(f"  --jobs N     Run up to N independent pipeline steps at once (default: {DEFAULT_JOBS})")
+    print("  --trace FILE Write a Chrome/Perfetto trace of every step to FILE")
+    print(f"\nPipeline commands can be combined (e.g. `{sys.argv[0]} cleanup apk tag`): their steps are")
+    print("merged into one plan in which shared steps run once. Pipelines are defined in PIPELINES and can be")
+    print(f"replaced or added under \"pipelines\" in {PROJECT_CONFIG_FILE}.")
+    print(f"\nFull output of every step is written to {LOG_DIR}/")
+    print("Exit codes: 0 success, 10 clean, 11 pub, 12 gen-l10n, 13 build_runner, 14 fix/format, 15 analyze,")
+    print("            16 assets, 20 apk, 21 apk-split, 22 aab, 23 web, 24 web precompression,")
+    print("            1 other failures, 130 interrupted")
     sys.exit(1)
 
-def main():
-    """Main function"""
-    # Create required directories if they don't exist
-    os.makedirs("build/app/outputs/flutter-apk", exist_ok=True)
-    os.makedirs("build/app/outputs/bundle/release", exist_ok=True)
-    if len(sys.argv) < 2:
-        show_usage()
-    command = sys.argv[1].lower()
+def dispatch_command(command, args):
+    """Runs the function behind a command name. Returns False when the command failed."""
     if command == "apk":
-        build_apk()
+        return build_apk()
     elif command == "apk-split":
-        build_apk_split_per_abi()
+        return build_apk_split_per_abi()
     elif command == "aab":
-        build_aab()
+        return build_aab()
+    elif command == "web":
+        return build_web()
+    elif command == "size":
+        return analyze_sizes(args[1:])
+    elif command == "matrix":
+        return build_matrix(args[1:])
     elif command == "lang":
-        generate_lang()
+        return generate_lang()
     elif command == "db":
-        run_build_runner()
+        return run_build_runner()
     elif command == "setup":
-        full_setup()
+        return full_setup()
     elif command == "cache-repair":
-        repair_cache()
+        return repair_cache()
+    elif command == "cache-verify":
+        return verify_cache()
+    elif command == "check":
+        return check_changed()
     elif command == "cleanup":
-        cleanup_project()
+        return cleanup_project()
     elif command == "release-run":
-        release_run()
+        return release_run()
+    elif command == "install":
+        return install_command(args[1:])
     elif command == "uninstall":
-        uninstall_app()
+        return uninstall_app()
     elif command == "pod":
-        update_pods()
+        return update_pods(args[1:])
     elif command == "tag":
-        create_and_push_tag()
+        return create_and_push_tag()
+    elif command == "assets":
+        return optimize_assets_command()
+    elif command == "symbols":
+        return extract_symbols(args[1:])
+    elif command == "watch":
+        return watch_project()
+    elif command == "bench":
+        return run_benchmark(args[1:])
     elif command == "page":
-        if len(sys.argv) < 3:
-            print(f"{RED}Error: Page name is required.{NC}")
-            print(f"Usage: {sys.argv[0]} page <page_name>")
-            sys.exit(1)
-        create_page(sys.argv[2])
+        create_page(args[1:])
     else:
         show_usage()
 
+def failure_exit_code():
+    """Exit code of a failed command, identifying the first pipeline step that failed"""
+    if not FAILED_STEPS:
+        return EXIT_FAILURE
+    # Steps re-run in a merged plan are namespaced ("<command>.<id>"), their exit code is the original id's
+    failed = FAILED_STEPS[0]
+    exit_code = STEP_EXIT_CODES.get(failed.get("base_id", failed["id"]), EXIT_FAILURE)
+    print(f"{RED}Failed step: {failed['id']} (exit code {exit_code}){NC}")
+    return exit_code
+
+def main():
+    """Main function"""
+    # Create required directories if they don't exist
+    os.makedirs("build/app/outputs/flutter-apk", exist_ok=True)
+    os.makedirs("build/app/outputs/bundle/release", exist_ok=True)
+    args = parse_options(sys.argv[1:])
+    if not args:
+        show_usage()
+    command = args[0].lower()
+    commands = [arg.lower() for arg in args]
+    pipelines = pipeline_definitions()
+    # Several pipeline commands, --dry-run and pipelines added in the project config run as a plan
+    planned = (OPTIONS["dry_run"] or (len(commands) > 1 and all(name in pipelines for name in commands))
+               or (command in pipelines and command not in PIPELINES))
+    try:
+        if (plan_command(commands) if planned else dispatch_command(command, args)) is False:
+            sys.exit(failure_exit_code())
+    finally:
+        if OPTIONS["trace"]:
+            write_trace(OPTIONS["trace"])
+        if OPTIONS["monitor"]:
+            write_resource_report(OPTIONS["monitor"])
+
 if __name__ == "__main__":
-    # Handle Ctrl+C gracefully
+    # Handle Ctrl+C gracefully: stop every running command tree, then exit
     def signal_handler(sig, frame):
-        print("\nProcess interrupted. Exiting...")
-        sys.exit(0)
+        print("\nProcess interrupted. Stopping running commands...")
+        cancel_running_steps()
+        sys.exit(EXIT_INTERRUPTED)
     signal.signal(signal.SIGINT, signal_handler)
     main()